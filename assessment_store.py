@@ -0,0 +1,331 @@
+"""SQLite-backed store of every generated assessment.
+
+One row per employee and period: raw inputs (JSON), every KPI value, the category
+averages and the overall score. Regenerating a report for the same employee and
+period replaces the earlier row. Indexed for an employee's history and a manager's
+team in a given period.
+
+Per-manager, per-period rollups (score sums and a 10-point overall-score histogram)
+are maintained by triggers as rows are inserted, replaced or deleted, so dashboards
+read a few small tables instead of aggregating the full history.
+
+    python assessment_store.py import assessments.csv --db assessments.db
+"""
+import argparse
+import datetime
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from scoring import EMPLOYEE_FIELDS, FLOAT_INPUTS, INPUT_KEYS, KPIS, WEIGHTS, score_frame
+
+DEFAULT_DB_PATH = os.environ.get("ASSESSMENT_DB",
+                                 os.path.join(os.path.dirname(os.path.abspath(__file__)), "assessments.db"))
+DEFAULT_BATCH_SIZE = 10_000
+# Overall scores are bucketed per 10 points; the last bucket holds everything from 100% up
+SCORE_BUCKETS = 11
+
+KPI_COLUMNS = [f"kpi_{kpi.code}" for kpi in KPIS]
+CATEGORY_COLUMNS = list(WEIGHTS)
+COLUMNS = (["employee_id", "employee_name", "manager", "period", "created_at", "inputs"]
+           + KPI_COLUMNS + CATEGORY_COLUMNS + ["overall"])
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS assessments (
+    id INTEGER PRIMARY KEY,
+    employee_id TEXT NOT NULL,
+    employee_name TEXT NOT NULL,
+    manager TEXT NOT NULL,
+    period TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    {", ".join(f"{column} REAL NOT NULL" for column in KPI_COLUMNS + CATEGORY_COLUMNS)},
+    overall REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_assessments_employee_period ON assessments (employee_id, period);
+CREATE INDEX IF NOT EXISTS idx_assessments_manager_period ON assessments (manager, period);
+CREATE INDEX IF NOT EXISTS idx_assessments_period ON assessments (period);
+"""
+
+_ROLLUP_SUMS = ["overall"] + CATEGORY_COLUMNS
+
+
+def _rollup_trigger_body(row, sign):
+    """SQL adding (sign=+1) or removing (sign=-1) one assessment row to/from the rollup tables."""
+    sums = ", ".join(f"sum_{column}" for column in _ROLLUP_SUMS)
+    values = ", ".join(f"{sign} * {row}.{column}" for column in _ROLLUP_SUMS)
+    updates = ", ".join(f"sum_{column} = sum_{column} + excluded.sum_{column}" for column in _ROLLUP_SUMS)
+    bucket = f"MIN(CAST({row}.overall / 10 AS INTEGER), {SCORE_BUCKETS - 1})"
+    return f"""
+    INSERT INTO team_period_stats (manager, period, assessments, {sums})
+    VALUES ({row}.manager, {row}.period, {sign}, {values})
+    ON CONFLICT (manager, period) DO UPDATE SET assessments = assessments + excluded.assessments, {updates};
+    INSERT INTO team_period_buckets (manager, period, bucket, assessments)
+    VALUES ({row}.manager, {row}.period, {bucket}, {sign})
+    ON CONFLICT (manager, period, bucket) DO UPDATE SET assessments = assessments + excluded.assessments;"""
+
+
+ROLLUP_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS team_period_stats (
+    manager TEXT NOT NULL,
+    period TEXT NOT NULL,
+    assessments INTEGER NOT NULL,
+    {", ".join(f"sum_{column} REAL NOT NULL" for column in _ROLLUP_SUMS)},
+    PRIMARY KEY (manager, period)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS team_period_buckets (
+    manager TEXT NOT NULL,
+    period TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    assessments INTEGER NOT NULL,
+    PRIMARY KEY (manager, period, bucket)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS assessments_rollup_insert AFTER INSERT ON assessments BEGIN
+    {_rollup_trigger_body("NEW", 1)}
+END;
+CREATE TRIGGER IF NOT EXISTS assessments_rollup_update AFTER UPDATE ON assessments BEGIN
+    {_rollup_trigger_body("OLD", -1)}
+    {_rollup_trigger_body("NEW", 1)}
+END;
+CREATE TRIGGER IF NOT EXISTS assessments_rollup_delete AFTER DELETE ON assessments BEGIN
+    {_rollup_trigger_body("OLD", -1)}
+END;
+"""
+
+_UPSERT = (f"INSERT INTO assessments ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)}) "
+           f"ON CONFLICT (employee_id, period) DO UPDATE SET "
+           + ", ".join(f"{column} = excluded.{column}" for column in COLUMNS if column not in ("employee_id", "period")))
+
+
+def _rows_from_frame(frame, created_at):
+    """Scores a frame of validated assessments and yields one parameter tuple per row."""
+    scores = score_frame(frame)
+    # pandas' C encoder is far faster than json.dumps per row
+    input_json = frame[INPUT_KEYS].to_json(orient="records", lines=True, double_precision=15).splitlines()
+    score_values = scores[[kpi.code for kpi in KPIS] + CATEGORY_COLUMNS + ["overall"]].to_numpy().tolist()
+    details = frame[EMPLOYEE_FIELDS].astype(str).itertuples(index=False, name=None)
+    for (name, employee_id, manager, period), raw, values in zip(details, input_json, score_values):
+        yield (employee_id, name, manager, period, created_at, raw, *values)
+
+
+def _row_to_dict(row):
+    record = dict(row)
+    record["inputs"] = json.loads(record["inputs"])
+    record["kpis"] = {kpi.code: record.pop(f"kpi_{kpi.code}") for kpi in KPIS}
+    return record
+
+
+class AssessmentStore:
+    """Thread-safe access to the assessments database at `path`."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        # WAL lets readers (e.g. history lookups) run while an import is writing
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self._conn:
+            has_rollups = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'team_period_stats'").fetchone()
+            self._conn.executescript(SCHEMA + ROLLUP_SCHEMA)
+        if not has_rollups:
+            # Databases created before the rollup tables existed need a one-off backfill
+            self.rebuild_rollups()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _write(self, rows):
+        with self._lock, self._conn:
+            self._conn.executemany(_UPSERT, rows)
+
+    def save(self, employee_data, inputs):
+        """Saves (or replaces) one employee's assessment for their period."""
+        frame = pd.DataFrame([{**employee_data, **{key: inputs[key] for key in INPUT_KEYS}}])
+        created_at = datetime.datetime.now().isoformat(timespec="seconds")
+        self._write(list(_rows_from_frame(frame, created_at)))
+
+    def bulk_insert(self, frame, batch_size=DEFAULT_BATCH_SIZE):
+        """Saves every row of a frame of validated assessments; returns the number of rows written.
+
+        `frame` has the EMPLOYEE_FIELDS and INPUT_KEYS columns. Rows are scored with
+        score_frame and written in one transaction per `batch_size` rows.
+        """
+        created_at = datetime.datetime.now().isoformat(timespec="seconds")
+        for start in range(0, len(frame), batch_size):
+            self._write(list(_rows_from_frame(frame.iloc[start:start + batch_size], created_at)))
+        return len(frame)
+
+    def rebuild_rollups(self):
+        """Recomputes the rollup tables from scratch with one GROUP BY over all assessments."""
+        sums = ", ".join(f"sum_{column}" for column in _ROLLUP_SUMS)
+        totals = ", ".join(f"SUM({column})" for column in _ROLLUP_SUMS)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM team_period_stats")
+            self._conn.execute("DELETE FROM team_period_buckets")
+            self._conn.execute(f"INSERT INTO team_period_stats (manager, period, assessments, {sums}) "
+                               f"SELECT manager, period, COUNT(*), {totals} FROM assessments GROUP BY manager, period")
+            self._conn.execute(
+                "INSERT INTO team_period_buckets (manager, period, bucket, assessments) "
+                f"SELECT manager, period, MIN(CAST(overall / 10 AS INTEGER), {SCORE_BUCKETS - 1}) AS bucket, COUNT(*) "
+                "FROM assessments GROUP BY manager, period, bucket")
+
+    def employee_history(self, employee_id):
+        """Returns every assessment of one employee, oldest period first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM assessments WHERE employee_id = ?", (employee_id,)).fetchall()
+        # ORDER BY period would compare the labels as text ("Q1 2026" before "Q4 2025")
+        history = [_row_to_dict(row) for row in rows]
+        return sorted(history, key=lambda record: (period_sort_key(record["period"]), record["created_at"]))
+
+    def team(self, manager, period):
+        """Returns the assessments of a manager's team for one period, best overall score first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM assessments WHERE manager = ? AND period = ? ORDER BY overall DESC",
+                (manager, period)).fetchall()
+        return [_row_to_dict(row) for row in rows]
+
+    # --- Rollups ---
+    def periods(self):
+        """Returns every period with at least one assessment, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT period FROM team_period_stats WHERE assessments > 0").fetchall()
+        return sorted((row[0] for row in rows), key=period_sort_key)
+
+    def team_rollups(self, manager=None, period=None):
+        """Returns per-manager, per-period averages from the rollup table, optionally filtered.
+
+        Each dict has manager, period, assessments, overall and one average per category.
+        """
+        clauses, params = ["assessments > 0"], []
+        if manager is not None:
+            clauses.append("manager = ?")
+            params.append(manager)
+        if period is not None:
+            clauses.append("period = ?")
+            params.append(period)
+        averages = ", ".join(f"sum_{column} / assessments AS {column}" for column in _ROLLUP_SUMS)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT manager, period, assessments, {averages} FROM team_period_stats "
+                f"WHERE {' AND '.join(clauses)}", params).fetchall()
+        return [dict(row) for row in rows]
+
+    def score_distribution(self, period, manager=None):
+        """Returns the number of overall scores per 10-point bucket (a list of SCORE_BUCKETS counts)."""
+        query = "SELECT bucket, SUM(assessments) FROM team_period_buckets WHERE period = ?"
+        params = [period]
+        if manager is not None:
+            query += " AND manager = ?"
+            params.append(manager)
+        counts = [0] * SCORE_BUCKETS
+        with self._lock:
+            for bucket, count in self._conn.execute(query + " GROUP BY bucket", params):
+                counts[bucket] = count
+        return counts
+
+
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_store(path=None):
+    """Returns this process's AssessmentStore for `path` (default: DEFAULT_DB_PATH), opening it once.
+
+    The app and the dashboard page share it, so each server process holds one connection.
+    """
+    path = path or DEFAULT_DB_PATH
+    with _STORES_LOCK:
+        store = _STORES.get(path)
+        if store is None:
+            store = _STORES[path] = AssessmentStore(path)
+    return store
+
+
+def period_sort_key(period):
+    """Orders periods like "Q3 2025" chronologically; anything else sorts after, alphabetically."""
+    match = re.fullmatch(r"\s*Q([1-4])\s+(\d{4})\s*", period, re.IGNORECASE)
+    if match:
+        return 0, int(match.group(2)), int(match.group(1)), period
+    return 1, 0, 0, period
+
+
+# --- Imports ---
+def prepare_frame(frame):
+    """Validates a raw chunk (e.g. from a CSV) column-wise. Returns (valid_frame, skipped_count).
+
+    Blank KPI cells count as 0; rows with missing employee details or non-numeric,
+    negative or fractional-count inputs are skipped.
+    """
+    frame = frame.copy()
+    valid = pd.Series(True, index=frame.index)
+    for field in EMPLOYEE_FIELDS:
+        if field not in frame:
+            return frame.iloc[0:0], len(frame)
+        frame[field] = frame[field].astype(str).str.strip()
+        valid &= frame[field].ne("") & frame[field].ne("nan") & frame[field].ne("None")
+
+    for key in INPUT_KEYS:
+        raw = frame[key] if key in frame else pd.Series(0, index=frame.index)
+        raw = raw.replace("", 0).fillna(0)
+        numbers = pd.to_numeric(raw, errors="coerce").astype(np.float64)
+        ok = numbers.notna() & np.isfinite(numbers) & (numbers >= 0)
+        if key not in FLOAT_INPUTS:
+            ok &= numbers.mod(1).eq(0)
+        valid &= ok
+        frame[key] = numbers
+    frame = frame[valid]
+    for key in INPUT_KEYS:
+        if key not in FLOAT_INPUTS:
+            frame[key] = frame[key].astype(np.int64)
+    return frame, int((~valid).sum())
+
+
+def import_file(store, path, chunk_size=DEFAULT_BATCH_SIZE):
+    """Streams a CSV or Parquet file into the store. Returns (written, skipped)."""
+    from batch import iter_frames
+
+    written = skipped = 0
+    for chunk in iter_frames(path, chunk_size):
+        frame, chunk_skipped = prepare_frame(chunk)
+        written += store.bulk_insert(frame, batch_size=chunk_size)
+        skipped += chunk_skipped
+    return written, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the assessments database.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="Bulk-import a CSV or Parquet file of assessments")
+    import_parser.add_argument("input", help="CSV or Parquet file with one row per employee")
+    import_parser.add_argument("--db", default=DEFAULT_DB_PATH, help=f"Database path (default: {DEFAULT_DB_PATH})")
+    import_parser.add_argument("--chunk-size", type=int, default=DEFAULT_BATCH_SIZE,
+                               help=f"Rows per transaction (default: {DEFAULT_BATCH_SIZE})")
+    args = parser.parse_args(argv)
+
+    store = AssessmentStore(args.db)
+    start = time.perf_counter()
+    written, skipped = import_file(store, args.input, args.chunk_size)
+    elapsed = time.perf_counter() - start
+    store.close()
+    rate = written / elapsed if elapsed > 0 else 0
+    print(f"Imported {written} assessments into {args.db} ({skipped} rows skipped) "
+          f"in {elapsed:.2f}s - {rate:.0f} rows/second")
+    return 1 if skipped else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""Headless bulk report generator.
+
+Reads one employee per row from a CSV or Parquet file (columns: name, id, manager,
+period and the KPI widget keys such as f1_comp, c3_first, t7_total) and writes one
+PDF per employee, rendering chunks of rows on a process pool.
+
+    python batch.py assessments.csv --out reports --workers 8
+"""
+import argparse
+import concurrent.futures
+import os
+import re
+import sys
+import time
+
+from report import DEFAULT_PROFILE, OUTPUT_PROFILES, get_template
+from scoring import WEIGHTS, coerce_employee, coerce_inputs, score_assessment
+
+DEFAULT_CHUNK_SIZE = 200
+
+
+# --- Input Streaming ---
+def iter_frames(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yields DataFrames of up to `chunk_size` rows from a CSV or Parquet file without loading it all at once."""
+    if path.lower().endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        for record_batch in parquet_file.iter_batches(batch_size=chunk_size):
+            yield record_batch.to_pandas()
+    else:
+        import pandas as pd
+
+        # Read everything as text so IDs keep leading zeros; numbers are validated per row
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype=str, keep_default_na=False)
+
+
+def iter_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yields lists of row dicts from a CSV or Parquet file without loading it all at once."""
+    for frame in iter_frames(path, chunk_size):
+        yield frame.to_dict("records")
+
+
+def report_filename(employee_data):
+    """Builds a filesystem-safe file name per employee and period."""
+    stem = re.sub(r"[^A-Za-z0-9_.-]+", "_",
+                  f"{employee_data['id']}_{employee_data['name']}_{employee_data['period']}")
+    return f"Employee_Assessment_{stem}.pdf"
+
+
+def unique_filename(name, taken):
+    """Returns `name`, with a "_2", "_3", ... suffix if it is already in `taken`, and adds it there.
+
+    Keeps ZIP members distinct when an input repeats an employee and period.
+    """
+    stem, extension = os.path.splitext(name)
+    candidate, number = name, 1
+    while candidate in taken:
+        number += 1
+        candidate = f"{stem}_{number}{extension}"
+    taken.add(candidate)
+    return candidate
+
+
+def report_path(out_dir, employee_data):
+    """Builds the output path of an employee's report inside `out_dir`."""
+    return os.path.join(out_dir, report_filename(employee_data))
+
+
+# --- Worker ---
+def render_chunk(first_row, rows, out_dir, profile=DEFAULT_PROFILE):
+    """Scores and renders a chunk of rows. Returns (written, [(row_number, error), ...])."""
+    written = 0
+    errors = []
+    for row_number, row in enumerate(rows, start=first_row):
+        try:
+            employee_details = coerce_employee(row)
+            inputs = coerce_inputs(row)
+            results, _, overall_score = score_assessment(inputs)
+            pdf_bytes = get_template(profile).render(employee_details, results, overall_score, WEIGHTS)
+            with open(report_path(out_dir, employee_details), "wb") as f:
+                f.write(pdf_bytes)
+            written += 1
+        except Exception as exc:  # a bad row must not stop the run
+            errors.append((row_number, f"{type(exc).__name__}: {exc}"))
+    return written, errors
+
+
+def run(path, out_dir, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, profile=DEFAULT_PROFILE):
+    """Renders every row of `path` into `out_dir`. Returns (written, errors, elapsed_seconds)."""
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    written = 0
+    errors = []
+    start = time.perf_counter()
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        # Row numbers are 1-based data rows (excluding any header)
+        next_row = 1
+        for rows in iter_chunks(path, chunk_size):
+            pending.add(pool.submit(render_chunk, next_row, rows, out_dir, profile))
+            next_row += len(rows)
+            # Keep only a couple of chunks per worker in flight so memory stays bounded
+            if len(pending) >= workers * 2:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    chunk_written, chunk_errors = future.result()
+                    written += chunk_written
+                    errors.extend(chunk_errors)
+        for future in concurrent.futures.as_completed(pending):
+            chunk_written, chunk_errors = future.result()
+            written += chunk_written
+            errors.extend(chunk_errors)
+
+    return written, sorted(errors), time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate one assessment PDF per row of a CSV or Parquet file.")
+    parser.add_argument("input", help="CSV or Parquet file with one row per employee")
+    parser.add_argument("--out", default="reports", help="Output directory for the PDFs (default: reports)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Rows per work unit (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--profile", choices=sorted(OUTPUT_PROFILES), default=DEFAULT_PROFILE,
+                        help=f"PDF output profile; archive embeds a smaller logo (default: {DEFAULT_PROFILE})")
+    args = parser.parse_args(argv)
+
+    written, errors, elapsed = run(args.input, args.out, args.workers, args.chunk_size, args.profile)
+
+    for row_number, message in errors:
+        print(f"Row {row_number} skipped: {message}", file=sys.stderr)
+    rate = written / elapsed if elapsed > 0 else 0
+    print(f"Wrote {written} reports to {args.out} ({len(errors)} rows skipped) "
+          f"in {elapsed:.2f}s - {rate:.1f} reports/second")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Measures throughput and peak memory of streamed department packs.
+
+Writes a merged PDF and a ZIP for teams of increasing size to a discarding stream and
+reports reports/second and the tracemalloc peak; the peak should stay flat as the
+team grows. Tracing slows rendering down, so memory is measured in a second run.
+
+    python benchmarks/bench_pack.py --employees 500 5000
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from report_pack import write_pack, write_zip  # noqa: E402
+from scoring import INPUT_KEYS  # noqa: E402
+
+
+class NullStream(io.RawIOBase):
+    """Counts and discards written bytes, like a socket that is drained immediately."""
+
+    def __init__(self):
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.size += len(data)
+        return len(data)
+
+
+def assessments(count):
+    for number in range(count):
+        employee = {"name": f"Employee {number}", "id": f"{number:06d}", "manager": "Manager", "period": "Q3 2025"}
+        yield employee, {key: (number + index) % 50 + 1 for index, key in enumerate(INPUT_KEYS)}
+
+
+def measure(writer, count):
+    stream = NullStream()
+    start = time.perf_counter()
+    writer(assessments(count), stream)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    writer(assessments(count), NullStream())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count / elapsed, peak, stream.size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, nargs="+", default=[500, 5000],
+                        help="Team sizes to measure (default: 500 5000)")
+    args = parser.parse_args(argv)
+
+    write_pack(assessments(1), NullStream())  # warm-up: builds the template
+    for name, writer in (("merged PDF", write_pack), ("ZIP", write_zip)):
+        for count in args.employees:
+            rate, peak, size = measure(writer, count)
+            print(f"{name:10} {count:6d} employees: {rate:7.1f} reports/s, "
+                  f"peak {peak / 1024 / 1024:6.2f} MB, output {size / 1024 / 1024:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Reports the PDF size of each output profile and the bytes the archive profile saves.
+
+    python benchmarks/bench_profiles.py
+
+With PyMuPDF installed, the first page of every profile is also rasterised and compared
+with the print profile, to confirm that only the logo's resampling changes pixels.
+"""
+import argparse
+import datetime
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_suite import pathological_report, small_report, typical_report  # noqa: E402
+from report import OUTPUT_PROFILES, get_template  # noqa: E402
+from scoring import WEIGHTS  # noqa: E402
+
+# Channel differences up to this are anti-aliasing, e.g. from the print profile's transparency group
+NOISE = 8
+
+try:
+    import pymupdf
+except ImportError:  # optional, only for the pixel comparison
+    pymupdf = None
+
+
+def first_page_pixels(pdf_bytes, dpi):
+    pixmap = pymupdf.open(stream=pdf_bytes)[0].get_pixmap(dpi=dpi)
+    return pixmap.samples
+
+
+def pixel_difference(reference, other, dpi):
+    """Returns (largest channel difference, share of channel values differing by more than NOISE)."""
+    a, b = first_page_pixels(reference, dpi), first_page_pixels(other, dpi)
+    differences = [abs(x - y) for x, y in zip(a, b) if x != y]
+    return max(differences, default=0), sum(1 for difference in differences if difference > NOISE) / len(a)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dpi", type=int, default=150, help="Resolution of the pixel comparison (default: 150)")
+    args = parser.parse_args(argv)
+
+    generated_on = datetime.date(2025, 10, 1)
+    for name, make_report in (("small", small_report), ("typical", typical_report),
+                              ("pathological", pathological_report)):
+        employee, results, overall_score = make_report()
+        documents = {}
+        for profile in OUTPUT_PROFILES:
+            documents[profile] = bytes(get_template(profile).render(employee, results, overall_score, WEIGHTS, generated_on))
+        reference = documents["print"]
+        for profile, pdf_bytes in documents.items():
+            saved = len(reference) - len(pdf_bytes)
+            line = f"{name:13} {profile:8} {len(pdf_bytes):8d} B  saved {saved:7d} B ({saved / len(reference):4.0%})"
+            if pymupdf is not None and profile != "print":
+                largest, share = pixel_difference(reference, pdf_bytes, args.dpi)
+                line += f"  pixels changed: {share:.3%} (max {largest}/255 at {args.dpi} dpi)"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
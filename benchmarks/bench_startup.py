@@ -0,0 +1,94 @@
+"""Cold-start benchmark for app.py: import time and time to the first rendered page.
+
+Every run starts a fresh interpreter, imports Streamlit, then the app's own modules,
+and renders the page once with Streamlit's AppTest. The best of --runs is reported,
+since cold starts are noisy. The exit status is 1 when importing the app's modules
+takes longer than --max-import-ms, or when a module that should only load after the
+first click (the PDF stack, pandas) is already loaded once the first page is rendered.
+
+CI calls it with --gate, the startup regression gate: a single cold start (about a
+second), which is enough since the app's modules import in a fraction of the budget
+and the lazy-module check does not depend on timing.
+
+    python benchmarks/bench_startup.py --gate
+    python benchmarks/bench_startup.py --runs 10 --max-import-ms 150
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The modules app.py imports at the top, besides Streamlit and the standard library
+APP_MODULES = ["instrumentation", "live_preview", "report_cache", "report_queue", "report_store", "scoring", "tracing"]
+# Only needed once a report is generated or an assessment saved
+LAZY_MODULES = ["fpdf", "pandas", "pyarrow"]
+DEFAULT_MAX_IMPORT_MS = 150
+
+# Runs in the fresh interpreter; prints one JSON line
+CHILD = """
+import importlib, json, logging, sys, time, warnings
+warnings.filterwarnings("ignore")
+start = time.perf_counter()
+import streamlit
+from streamlit.testing.v1 import AppTest
+streamlit_done = time.perf_counter()
+for name in {modules!r}:
+    importlib.import_module(name)
+imported = time.perf_counter()
+logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+    lambda record: "missing ScriptRunContext" not in record.getMessage())
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.run()
+rendered = time.perf_counter()
+assert not at.exception, at.exception
+print(json.dumps({{"streamlit_ms": (streamlit_done - start) * 1000, "import_ms": (imported - streamlit_done) * 1000,
+                   "first_page_ms": (rendered - imported) * 1000,
+                   "loaded": [name for name in {lazy!r} if name in sys.modules]}}))
+"""
+
+
+def cold_start():
+    code = CHILD.format(modules=APP_MODULES, app=os.path.join(ROOT, "app.py"), lazy=LAZY_MODULES)
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    # Keep the run away from the real assessment database
+    env["ASSESSMENT_DB"] = os.path.join(tempfile.mkdtemp(prefix="bench-"), "assessments.db")
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True,
+                            check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to start (default: 5)")
+    parser.add_argument("--gate", action="store_true", help="CI gate: one cold start, whatever --runs says")
+    parser.add_argument("--max-import-ms", type=float, default=DEFAULT_MAX_IMPORT_MS,
+                        help=f"Budget for importing the app's modules (default: {DEFAULT_MAX_IMPORT_MS})")
+    args = parser.parse_args(argv)
+    if args.gate:
+        args.runs = 1
+
+    runs = [cold_start() for _ in range(args.runs)]
+    best = {metric: min(run[metric] for run in runs) for metric in ("streamlit_ms", "import_ms", "first_page_ms")}
+    total = sum(best.values())
+    print(f"import streamlit   {best['streamlit_ms']:8.1f} ms")
+    print(f"import app modules {best['import_ms']:8.1f} ms (budget {args.max_import_ms:.0f})")
+    print(f"first page run     {best['first_page_ms']:8.1f} ms")
+    print(f"cold start total   {total:8.1f} ms (best of {args.runs})")
+
+    failed = False
+    if best["import_ms"] > args.max_import_ms:
+        print(f"OVER BUDGET: importing the app's modules took {best['import_ms']:.1f} ms")
+        failed = True
+    loaded = sorted({name for run in runs for name in run["loaded"]})
+    if loaded:
+        print(f"LOADED TOO EARLY: {', '.join(loaded)} imported before the first click")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
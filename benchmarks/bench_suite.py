@@ -0,0 +1,234 @@
+"""Benchmark suite for scoring, PDF rendering and full headless runs of app.py.
+
+Every case records the median and best wall time, the tracemalloc peak of one extra
+(traced) run and, where a PDF is produced, its size. Results are written as JSON and
+compared with a stored baseline; the exit status is 1 when any metric regressed by
+more than its threshold.
+
+    python benchmarks/bench_suite.py                          # compare with benchmarks/baseline.json
+    python benchmarks/bench_suite.py --cases pdf_typical scoring --repeat 50
+    python benchmarks/bench_suite.py --update-baseline        # after an intended change
+
+Wall times depend on the machine, so refresh the baseline when moving to a new one.
+"""
+import argparse
+import base64
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from report import create_pdf, get_template  # noqa: E402
+from scoring import CATEGORIES, INPUT_KEYS, WEIGHTS, score_assessment  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# Allowed relative increase per metric before a case counts as a regression. Time is
+# compared on the best run, which is far less sensitive to machine noise than the median.
+DEFAULT_THRESHOLDS = {"min_ms": 0.5, "peak_kb": 0.25, "pdf_bytes": 0.02}
+
+EMPLOYEE = {"name": "Jane Doe", "id": "000123", "manager": "John Smith", "period": "Q3 2025"}
+INPUTS = {key: index + 1 for index, key in enumerate(INPUT_KEYS)}
+
+
+# --- Inputs ---
+def small_report():
+    results = {"Financial": {"Project Completion Rate": {"inputs": "1 / 2", "result": "50.0%"}}}
+    return {"name": "A", "id": "1", "manager": "B", "period": "Q1"}, results, 50.0
+
+
+def typical_report():
+    results, _, overall_score = score_assessment(INPUTS)
+    return EMPLOYEE, results, overall_score
+
+
+def pathological_report():
+    """Long labels and figures that wrap in multi_cell, and enough rows to break pages."""
+    results, _, overall_score = score_assessment(INPUTS)
+    long_results = {}
+    for category in CATEGORIES:
+        long_results[category] = {}
+        for repeat in range(3):
+            for label, row in results[category].items():
+                long_results[category][f"{label} ({repeat}) " + "measured across every site and shift " * 3] = {
+                    "inputs": " / ".join([row["inputs"]] * 6), "result": row["result"]}
+    employee = {"name": "Maximilian Alexander " * 3, "id": "0" * 30, "manager": "Bartholomew " * 4,
+                "period": "Q3 2025 (extended review)"}
+    return employee, long_results, overall_score
+
+
+# --- Cases ---
+def case_create_pdf(make_report):
+    def run():
+        employee, results, overall_score = make_report()
+        return create_pdf(employee, results, overall_score, WEIGHTS)
+    return run
+
+
+def case_template(profile="print"):
+    employee, results, overall_score = typical_report()
+    return lambda: get_template(profile).render(employee, results, overall_score, WEIGHTS)
+
+
+def case_scoring():
+    return lambda: score_assessment(INPUTS)
+
+
+def case_base64():
+    employee, results, overall_score = typical_report()
+    pdf_bytes = bytes(create_pdf(employee, results, overall_score, WEIGHTS))
+    return lambda: base64.b64encode(pdf_bytes)
+
+
+def _app_test():
+    from streamlit.testing.v1 import AppTest
+
+    return AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+
+
+def case_app_load():
+    def run():
+        at = _app_test()
+        at.run()
+        assert not at.exception, at.exception
+    return run
+
+
+def case_app_click():
+    runs = iter(range(1, 1_000_000))
+
+    def run():
+        at = _app_test()
+        at.run()
+        for widget, value in zip(at.sidebar.text_input, ["Jane Doe", "000123", "John Smith", "Q3 2025"]):
+            widget.set_value(value)
+        # A new input every time, so the click renders instead of hitting the report cache
+        at.number_input(key="f1_comp").set_value(next(runs))
+        at.number_input(key="f1_plan").set_value(10)
+        at.button[0].click().run()
+        assert not at.exception, at.exception
+    return run
+
+
+# name -> (builds the timed callable, default repeats)
+CASES = {
+    "pdf_small": (lambda: case_create_pdf(small_report), 30),
+    "pdf_typical": (lambda: case_create_pdf(typical_report), 30),
+    "pdf_pathological": (lambda: case_create_pdf(pathological_report), 10),
+    "pdf_template": (case_template, 30),
+    "pdf_archive": (lambda: case_template("archive"), 30),
+    "scoring": (case_scoring, 500),
+    "base64": (case_base64, 500),
+    "app_load": (case_app_load, 5),
+    "app_click": (case_app_click, 5),
+}
+
+
+def measure(build, repeat):
+    run = build()
+    output = run()  # warm-up, excluded from timing
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = {"wall_ms": statistics.median(timings) * 1000, "min_ms": min(timings) * 1000,
+              "peak_kb": peak / 1024, "repeat": repeat}
+    if isinstance(output, (bytes, bytearray)) and output.startswith(b"%PDF"):
+        result["pdf_bytes"] = len(output)
+    return result
+
+
+def compare(results, baseline, thresholds):
+    """Returns [(case, metric, baseline value, current value, relative change)] over the thresholds."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric, limit in thresholds.items():
+            if metric in current and previous.get(metric):
+                change = current[metric] / previous[metric] - 1
+                if change > limit:
+                    regressions.append((name, metric, previous[metric], current[metric], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES),
+                        help="Cases to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=None, help="Timed runs per case (default: per case)")
+    parser.add_argument("--output", default=None, help="Write the results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare with")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    for metric, limit in DEFAULT_THRESHOLDS.items():
+        parser.add_argument(f"--max-{metric.replace('_', '-')}", type=float, default=limit, dest=metric,
+                            help=f"Allowed relative increase of {metric} (default: {limit:.2f})")
+    args = parser.parse_args(argv)
+
+    warnings.filterwarnings("ignore")
+    # AppTest touches session state from the main thread, which Streamlit warns about on every
+    # run; Streamlit resets its logger levels, so drop the message with a filter instead
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+        lambda record: "missing ScriptRunContext" not in record.getMessage())
+    # Keep app runs away from the real assessment database
+    os.environ["ASSESSMENT_DB"] = os.path.join(tempfile.mkdtemp(prefix="bench-"), "assessments.db")
+
+    results = {}
+    for name in args.cases:
+        build, repeat = CASES[name]
+        results[name] = measure(build, args.repeat or repeat)
+        row = results[name]
+        size = f"{row['pdf_bytes']:8d} B" if "pdf_bytes" in row else ""
+        print(f"{name:18} {row['wall_ms']:10.3f} ms (min {row['min_ms']:.3f})  peak {row['peak_kb']:9.1f} KB  {size}")
+
+    document = {"python": platform.python_version(), "machine": platform.machine(), "cases": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {"cases": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        # Cases that were not run keep their previous baseline
+        baseline.update({key: value for key, value in document.items() if key != "cases"})
+        baseline["cases"].update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)["cases"]
+    thresholds = {metric: getattr(args, metric) for metric in DEFAULT_THRESHOLDS}
+    regressions = compare(results, baseline, thresholds)
+    for name, metric, previous, current, change in regressions:
+        print(f"REGRESSION {name} {metric}: {previous:.1f} -> {current:.1f} (+{change:.0%})")
+    if not regressions:
+        print("No regressions against the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Compares the per-row cost of the KPI table layout against the previous multi_cell loop.
+
+    python benchmarks/bench_table.py --repeat 50
+
+The previous loop printed each cell with multi_cell, which wraps the text again on
+every call, and re-positioned the cursor between cells to fake the row height.
+KpiTable is timed cold (a new table, so empty width caches, per run: the cost of
+a report with text never seen before) and warm (one table re-used across runs, as
+the shared template does for repeated KPI names and inputs).
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fpdf import FPDF, XPos, YPos  # noqa: E402
+
+from bench_suite import pathological_report, typical_report  # noqa: E402
+from report_table import KpiTable  # noqa: E402
+from scoring import WEIGHTS  # noqa: E402
+
+
+def multi_cell_rows(pdf, results, weights):
+    """The row loop create_pdf used before report_table (no page-break handling)."""
+    for category, kpis in results.items():
+        if not kpis:
+            continue
+        weight_percent = int(weights.get(category.lower(), 0) * 100)
+        category_title = f"{category} ({weight_percent}%)" if weight_percent > 0 else category
+        pdf.set_font("Helvetica", 'B', 10)
+        pdf.set_fill_color(242, 182, 109)
+        pdf.cell(190, 8, category_title, 1, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='L', fill=True)
+        pdf.set_font("Helvetica", '', 9)
+        for kpi, data in kpis.items():
+            y_before = pdf.get_y()
+            x = pdf.l_margin
+            y_after = y_before
+            for text, (w, align) in zip((kpi, data['inputs'], data['result']), ((90, 'L'), (60, 'L'), (40, 'C'))):
+                pdf.set_xy(x, y_before)
+                pdf.multi_cell(w, 6, text, 1, align, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+                y_after = max(y_after, pdf.get_y())
+                x += w
+            pdf.set_y(y_after)
+
+
+def microseconds_per_row(draw, results, repeat):
+    rows = sum(len(kpis) for kpis in results.values())
+    timings = []
+    for run in range(repeat + 1):
+        pdf = FPDF()
+        pdf.add_page()
+        start = time.perf_counter()
+        draw(pdf, results, WEIGHTS)
+        if run:  # the first run is a warm-up
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings) / rows * 1e6, min(timings) / rows * 1e6, pdf.pages_count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=30, help="Timed runs per variant (default: 30)")
+    args = parser.parse_args(argv)
+
+    for name, make_report in (("typical", typical_report), ("pathological", pathological_report)):
+        _, results, _ = make_report()
+        variants = (("multi_cell", multi_cell_rows),
+                    ("KpiTable cold", lambda pdf, results, weights: KpiTable().draw_rows(pdf, results, weights)),
+                    ("KpiTable warm", KpiTable().draw_rows))
+        for variant, draw in variants:
+            median, best, pages = microseconds_per_row(draw, results, args.repeat)
+            print(f"{name:13} {variant:13} {median:8.1f} us/row (min {best:.1f})  {pages} pages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Compares reports/second of create_pdf against the pre-built ReportTemplate.
+
+    python benchmarks/bench_template.py --reports 200
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from report import create_pdf, get_template  # noqa: E402
+from scoring import INPUT_KEYS, WEIGHTS, score_assessment  # noqa: E402
+
+EMPLOYEE = {"name": "Jane Doe", "id": "000123", "manager": "John Smith", "period": "Q3 2025"}
+
+
+def reports_per_second(render, reports, results, overall_score):
+    render(EMPLOYEE, results, overall_score, WEIGHTS)  # warm-up, excluded from timing
+    start = time.perf_counter()
+    for _ in range(reports):
+        render(EMPLOYEE, results, overall_score, WEIGHTS)
+    return reports / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reports", type=int, default=200, help="Reports rendered per variant (default: 200)")
+    args = parser.parse_args(argv)
+
+    results, _, overall_score = score_assessment({key: index + 1 for index, key in enumerate(INPUT_KEYS)})
+    baseline = reports_per_second(create_pdf, args.reports, results, overall_score)
+    template = reports_per_second(get_template().render, args.reports, results, overall_score)
+    print(f"create_pdf:            {baseline:8.1f} reports/s")
+    print(f"ReportTemplate.render: {template:8.1f} reports/s ({template / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
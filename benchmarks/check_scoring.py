@@ -0,0 +1,99 @@
+"""Checks the vectorized scoring against the original scalar formulas.
+
+    python benchmarks/check_scoring.py --cases 5000
+
+Random assessments (with zero denominators, fractional hours and scores, and large
+counts) are scored by score_assessment, one at a time, and by score_frame, all at once,
+and every KPI, category average and overall score is compared with the scalar code
+scoring.py used before score_frame existed. Results must be bit-identical, since
+reports print them and the assessment store keeps them; the exit status is 1 on any
+difference.
+"""
+import argparse
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd  # noqa: E402
+
+from scoring import CATEGORIES, FLOAT_INPUTS, INPUT_KEYS, KPIS, WEIGHTS, score_assessment, score_frame  # noqa: E402
+
+
+def scalar_scores(inputs):
+    """The original per-assessment loop; returns ({kpi code: value}, results, category averages, overall)."""
+    values = {}
+    results = {category: {} for category in CATEGORIES}
+    scores = {category.lower(): [] for category in CATEGORIES}
+
+    for kpi in KPIS:
+        a = inputs[kpi.num]
+        b = inputs[kpi.den] if kpi.den else None
+        if kpi.kind == "ratio":
+            r = (a / b) * 100 if b > 0 else 0
+            scores[kpi.category.lower()].append(r)
+        elif kpi.kind == "average":
+            r = a / b if b > 0 else 0
+        else:
+            r = a
+        values[kpi.code] = r
+        results[kpi.category][kpi.label] = {"inputs": kpi.inputs_fmt.format(a=a, b=b),
+                                            "result": kpi.result_fmt.format(a=a, r=r)}
+
+    category_averages = {name: sum(values) / len(values) if values else 0 for name, values in scores.items()}
+
+    total_weight = sum(WEIGHTS.values())
+    overall_score = 0
+    if total_weight > 0:
+        weighted_sum = sum(category_averages[name] * weight for name, weight in WEIGHTS.items())
+        overall_score = weighted_sum / total_weight
+
+    return values, results, category_averages, overall_score
+
+
+def random_inputs(rng):
+    inputs = {}
+    for key in INPUT_KEYS:
+        roll = rng.random()
+        if roll < 0.15:
+            value = 0  # zero denominators, and KPIs with nothing done
+        elif roll < 0.2:
+            value = rng.randint(10 ** 6, 10 ** 9)
+        else:
+            value = rng.randint(1, 500)
+        inputs[key] = value + rng.choice((0, 0.25, 0.5, 0.1)) if key in FLOAT_INPUTS else value
+    return inputs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=2000, help="Random assessments to check (default: 2000)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    cases = [{key: 0 for key in INPUT_KEYS}] + [random_inputs(rng) for _ in range(args.cases)]
+    frame = score_frame(pd.DataFrame(cases))
+
+    mismatches = 0
+    for row, inputs in enumerate(cases):
+        values, results, category_averages, overall_score = scalar_scores(inputs)
+        expected = {**values, **category_averages, "overall": overall_score}
+        problems = []
+        if score_assessment(inputs) != (results, category_averages, overall_score):
+            problems.append("score_assessment")
+        problems += [f"score_frame[{column}]" for column, value in expected.items()
+                     if frame.at[row, column] != value]
+        if problems:
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"case {row}: {', '.join(problems)} differ for {inputs}")
+
+    print(f"{len(cases)} assessments, {mismatches} differing from the scalar formulas")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
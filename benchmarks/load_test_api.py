@@ -0,0 +1,111 @@
+"""Load test for the report API (report_api.py): requests/second and latency percentiles.
+
+    python benchmarks/load_test_api.py --start-server --requests 2000 --concurrency 32
+    python benchmarks/load_test_api.py --url http://127.0.0.1:8502 --format json --batch-size 50
+
+Every request carries different KPI inputs, so PDF requests miss the server's report
+cache and measure real rendering.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError, HTTPRequest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scoring import INPUT_KEYS  # noqa: E402
+
+
+def payload(number):
+    employee = {"name": f"Employee {number}", "id": f"{number:06d}", "manager": "Manager", "period": "Q3 2025"}
+    return {"employee": employee, "inputs": {key: (number + index) % 50 + 1 for index, key in enumerate(INPUT_KEYS)}}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_values[min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))]
+
+
+async def run_load(url, requests, concurrency, output_format, batch_size):
+    AsyncHTTPClient.configure(None, max_clients=concurrency)
+    client = AsyncHTTPClient()
+    endpoint = f"{url}/reports/batch" if batch_size > 1 else f"{url}/reports"
+    query = "?format=json" if output_format == "json" else ""
+    numbers = iter(range(requests))
+    latencies, failures = [], []
+
+    async def worker():
+        for number in numbers:
+            if batch_size > 1:
+                body = {"assessments": [payload(number * batch_size + item) for item in range(batch_size)]}
+            else:
+                body = payload(number)
+            request = HTTPRequest(endpoint + query, method="POST", body=json.dumps(body), request_timeout=300)
+            start = time.perf_counter()
+            try:
+                await client.fetch(request)
+            except (HTTPClientError, OSError) as exc:
+                failures.append(str(exc))
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, failures, time.perf_counter() - start
+
+
+def start_server(port, workers):
+    command = [sys.executable, os.path.join(ROOT, "report_api.py"), "--port", str(port)]
+    if workers:
+        command += ["--workers", str(workers)]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    # The server prints its address once the workers are up
+    server.stdout.readline()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8502", help="Base URL of the API")
+    parser.add_argument("--requests", type=int, default=1000, help="Total requests (default: 1000)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight (default: 16)")
+    parser.add_argument("--format", choices=["pdf", "json"], default="pdf", help="Response format (default: pdf)")
+    parser.add_argument("--batch-size", type=int, default=1, help="Assessments per request; >1 uses /reports/batch")
+    parser.add_argument("--start-server", action="store_true", help="Start a local report_api.py for the test")
+    parser.add_argument("--port", type=int, default=8502, help="Port for --start-server (default: 8502)")
+    parser.add_argument("--workers", type=int, default=None, help="Render processes for --start-server")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.start_server:
+        server = start_server(args.port, args.workers)
+        args.url = f"http://127.0.0.1:{args.port}"
+    try:
+        latencies, failures, elapsed = asyncio.run(
+            run_load(args.url, args.requests, args.concurrency, args.format, args.batch_size))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    latencies.sort()
+    print(f"{len(latencies)} ok, {len(failures)} failed in {elapsed:.2f}s "
+          f"({args.concurrency} concurrent, {args.format}, batch size {args.batch_size})")
+    if failures:
+        print(f"First failure: {failures[0]}")
+    if latencies:
+        reports = len(latencies) * args.batch_size
+        print(f"{len(latencies) / elapsed:.1f} requests/s ({reports / elapsed:.1f} reports/s)")
+        print(f"latency p50 {percentile(latencies, 0.50) * 1000:.1f} ms, "
+              f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms, max {latencies[-1] * 1000:.1f} ms")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,415 @@
+"""Derives the Customers and Processes KPI inputs from raw ticket and incident exports.
+
+Both exports have one row per ticket or incident and may be CSV, JSON Lines or Parquet.
+They are streamed in chunks with pyarrow and reduced per chunk with a columnar
+group-by on (employee_id, period), so memory grows with the number of employees and
+periods rather than with the size of the export.
+
+Ticket columns (only employee_id and opened_at are required):
+    employee_id, period, employee_name, manager
+    opened_at                  -> c4_handled, c5_opened, c3_total, p5_total (ticket count)
+    first_response_at          -> c2_time (hours to first response), c2_tickets
+    first_contact_resolution   -> c3_first
+    closed_at                  -> c5_closed
+    escalated                  -> p5_esc
+    satisfaction (1-5 rating)  -> c1_pos (4 or 5), c1_total
+
+Incident columns (only employee_id and started_at are required):
+    employee_id, period, employee_name, manager
+    started_at                 -> p3_total (incident count)
+    resolved_at                -> p2_time (hours to resolve), p2_inc
+    root_cause (non-empty)     -> p3_root
+    recurring                  -> p4_issues
+    preventive_action          -> p4_actions
+
+Without a period column, rows are assigned to the quarter of opened_at/started_at,
+e.g. "Q3 2025". An input is only derived when its source column is present, so
+values entered by hand in --assessments are kept otherwise. Timestamps are ISO 8601
+(e.g. "2025-07-01 10:00" or "2025-07-01T10:00:00Z"); rows with a timestamp or rating
+that does not parse are skipped and counted, like rows without an employee.
+
+    python event_import.py --tickets tickets.parquet --incidents incidents.csv \\
+        --assessments manual.csv --out assessments.csv --db assessments.db
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from scoring import FLOAT_INPUTS, INPUT_KEYS
+
+# The CSV/JSON readers parse several blocks ahead, so memory scales with the block size
+DEFAULT_BLOCK_BYTES = 1024 * 1024
+DEFAULT_BATCH_ROWS = 64 * 1024
+# Partial aggregates are merged once this many have piled up
+COMPACT_EVERY = 16
+
+KEYS = ["employee_id", "period"]
+DETAIL_COLUMNS = ["employee_name", "manager"]
+TRUE_STRINGS = ["true", "t", "yes", "y", "1"]
+# ISO 8601 as Arrow's cast reads it: a date with an optional time (microseconds at most),
+# and "Z" or an offset only after a time
+_ISO_DATE = r"[1-9]\d{3}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])"
+_ISO_TIME = r"[T ]([01]\d|2[0-3])(:[0-5]\d(:[0-5]\d(\.\d{1,6})?)?)?"
+LOCAL_PATTERN = f"^{_ISO_DATE}({_ISO_TIME})?$"
+ZONED_PATTERN = rf"^{_ISO_DATE}{_ISO_TIME}(Z|[+-]([01]\d|2[0-3])(:?[0-5]\d)?)$"
+NUMBER_PATTERN = r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$"
+
+
+class EventSource:
+    """Which columns of an export feed which inputs; see the module docstring."""
+
+    def __init__(self, name, timestamp, durations, flags, ratings, counts):
+        self.name = name
+        self.timestamp = timestamp  # required; counted per row and used to derive the period
+        self.durations = durations  # column -> (hours input, count input), measured from `timestamp`
+        self.flags = flags          # boolean column -> input counting true values
+        self.ratings = ratings      # 1-5 rating column -> (positive input, responses input)
+        self.counts = counts        # inputs equal to the number of rows
+
+    @property
+    def columns(self):
+        return ([self.timestamp] + list(self.durations) + list(self.flags) + list(self.ratings)
+                + KEYS + DETAIL_COLUMNS)
+
+
+TICKETS = EventSource(
+    "tickets", "opened_at",
+    durations={"first_response_at": ("c2_time", "c2_tickets")},
+    flags={"first_contact_resolution": "c3_first", "closed_at": "c5_closed", "escalated": "p5_esc"},
+    ratings={"satisfaction": ("c1_pos", "c1_total")},
+    counts=["c3_total", "c4_handled", "c5_opened", "p5_total"],
+)
+INCIDENTS = EventSource(
+    "incidents", "started_at",
+    durations={"resolved_at": ("p2_time", "p2_inc")},
+    flags={"root_cause": "p3_root", "recurring": "p4_issues", "preventive_action": "p4_actions"},
+    ratings={},
+    counts=["p3_total"],
+)
+
+
+# --- Streaming Readers ---
+def _csv_header(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return next(csv.reader(f), [])
+
+
+def iter_batches(path, columns, block_bytes=DEFAULT_BLOCK_BYTES, batch_rows=DEFAULT_BATCH_ROWS):
+    """Yields RecordBatches of the `columns` present in a CSV, JSON Lines or Parquet file."""
+    lower = path.lower()
+    if lower.endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        present = [name for name in columns if name in parquet_file.schema_arrow.names]
+        yield from parquet_file.iter_batches(batch_size=batch_rows, columns=present)
+    elif lower.endswith((".jsonl", ".ndjson", ".json")):
+        import pyarrow.json as pj
+
+        reader = pj.open_json(path, read_options=pj.ReadOptions(block_size=block_bytes))
+        present = [name for name in columns if name in reader.schema.names]
+        for batch in reader:
+            yield batch.select(present)
+    else:
+        import pyarrow.csv as pcsv
+
+        present = [name for name in columns if name in _csv_header(path)]
+        # Text columns stay text (IDs keep leading zeros); timestamps and flags are parsed later
+        convert = pcsv.ConvertOptions(include_columns=present,
+                                      column_types={name: pa.string() for name in present})
+        yield from pcsv.open_csv(path, read_options=pcsv.ReadOptions(block_size=block_bytes),
+                                 convert_options=convert)
+
+
+# --- Column Normalization ---
+def _timestamps(column):
+    """Timestamps without a time zone; zoned values are converted to UTC first, unreadable ones are null.
+
+    Readable values are picked out with vectorized pattern matches, so each batch
+    takes a single cast however many of its values are bad.
+    """
+    if pa.types.is_timestamp(column.type):
+        return column.cast(pa.timestamp("us"))
+    if pa.types.is_date(column.type):
+        return column.cast(pa.timestamp("us"))
+    text = pc.utf8_trim_whitespace(column.cast(pa.string()))
+    local = pc.fill_null(pc.match_substring_regex(text, LOCAL_PATTERN), False)
+    # ISO 8601 values may end in "Z" or an offset, as most ticketing systems export them
+    zoned = pc.fill_null(pc.match_substring_regex(text, ZONED_PATTERN), False)
+    # The patterns allow day 31 in every month; strptime rolls such dates over (Feb 30 -> Mar 2)
+    dates = pc.if_else(pc.or_(local, zoned), text, None)
+    rolled = pc.strptime(pc.utf8_slice_codeunits(dates, 0, 10), "%Y-%m-%d", "us", error_is_null=True)
+    real = pc.fill_null(pc.equal(pc.day(rolled), pc.utf8_slice_codeunits(dates, 8, 10).cast(pa.int64())), False)
+    local, zoned = pc.and_(local, real), pc.and_(zoned, real)
+    naive = pc.if_else(local, text, None).cast(pa.timestamp("us"))
+    utc = pc.if_else(zoned, text, None).cast(pa.timestamp("us", "UTC")).cast(pa.timestamp("us"))
+    return pc.if_else(zoned, utc, naive)
+
+
+def _unreadable(column, parsed):
+    """True where `column` has a value that parsing turned into null."""
+    return pc.and_(_present(column), pc.is_null(parsed))
+
+
+def _flags(column):
+    """True/false per row; nulls, blanks and "false"-like text are false."""
+    if pa.types.is_boolean(column.type):
+        return pc.fill_null(column, False)
+    if pa.types.is_integer(column.type) or pa.types.is_floating(column.type):
+        return pc.fill_null(pc.not_equal(column, 0), False)
+    if pa.types.is_timestamp(column.type) or pa.types.is_date(column.type):
+        return pc.is_valid(column)
+    return pc.fill_null(pc.is_in(pc.utf8_lower(pc.utf8_trim_whitespace(column.cast(pa.string()))),
+                                 value_set=pa.array(TRUE_STRINGS)), False)
+
+
+def _present(column):
+    """True for non-null, non-blank values (e.g. a documented root cause or a closing time)."""
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        return pc.fill_null(pc.not_equal(pc.utf8_trim_whitespace(column), ""), False)
+    return pc.is_valid(column)
+
+
+def _numbers(column):
+    """Float values per row; blanks and unreadable values are null."""
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        column = pc.utf8_trim_whitespace(column)
+        column = pc.if_else(pc.fill_null(pc.match_substring_regex(column, NUMBER_PATTERN), False), column, None)
+    numbers = column.cast(pa.float64())
+    return pc.if_else(pc.is_finite(numbers), numbers, None)
+
+
+def _quarters(timestamps):
+    quarter = pc.cast(pc.quarter(timestamps), pa.string())
+    year = pc.cast(pc.year(timestamps), pa.string())
+    return pc.binary_join_element_wise(pc.binary_join_element_wise("Q", quarter, ""), year, " ")
+
+
+def reduce_batch(batch, source):
+    """Aggregates one chunk per (employee_id, period). Returns (partial table, skipped rows)."""
+    names = batch.schema.names
+    start = _timestamps(batch.column(source.timestamp))
+    # A value that does not parse is null; its row is skipped rather than failing the import
+    unreadable = _unreadable(batch.column(source.timestamp), start)
+    employee = pc.utf8_trim_whitespace(batch.column("employee_id").cast(pa.string()))
+    if "period" in names:
+        period = pc.utf8_trim_whitespace(batch.column("period").cast(pa.string()))
+        period = pc.if_else(pc.fill_null(pc.equal(period, ""), True), _quarters(start), period)
+    else:
+        period = _quarters(start)
+
+    columns = {"employee_id": employee, "period": period, "rows": pa.array(np.ones(len(batch), dtype=np.int64))}
+    aggregates = [("rows", "sum")]
+    for name in DETAIL_COLUMNS:
+        if name in names:
+            columns[name] = pc.utf8_trim_whitespace(batch.column(name).cast(pa.string()))
+            aggregates.append((name, "max"))
+    for name in source.durations:
+        if name in names:
+            timestamps = _timestamps(batch.column(name))
+            unreadable = pc.or_(unreadable, _unreadable(batch.column(name), timestamps))
+            microseconds = pc.subtract(timestamps, start).cast(pa.int64())
+            hours = pc.divide(microseconds.cast(pa.float64()), 3_600_000_000.0)
+            # A response or resolution before the ticket/incident started is bad data: ignore it
+            columns[name] = pc.if_else(pc.less(hours, 0), None, hours)
+            aggregates += [(name, "sum"), (name, "count")]
+    for name in source.flags:
+        if name in names:
+            column = batch.column(name)
+            flags = _present(column) if name in ("root_cause", "closed_at") else _flags(column)
+            columns[name] = flags.cast(pa.int64())
+            aggregates.append((name, "sum"))
+    for name in source.ratings:
+        if name in names:
+            ratings = _numbers(batch.column(name))
+            unreadable = pc.or_(unreadable, _unreadable(batch.column(name), ratings))
+            columns[name] = pc.greater_equal(ratings, 4).cast(pa.int64())
+            aggregates += [(name, "sum"), (name, "count")]
+
+    table = pa.table(columns)
+    # Rows without an employee or a start time cannot be attributed
+    valid = pc.and_(pc.fill_null(pc.not_equal(employee, ""), False), pc.is_valid(start))
+    valid = pc.and_not(valid, unreadable)
+    skipped = len(table) - pc.sum(valid.cast(pa.int64())).as_py()
+    table = table.filter(valid)
+    return table.group_by(KEYS, use_threads=False).aggregate(aggregates), skipped
+
+
+def _combine(partials):
+    """Merges partial aggregates: sums and counts add up, names keep the maximum."""
+    table = pa.concat_tables(partials)
+    aggregates = [(name, "max" if name.endswith("_max") else "sum") for name in table.schema.names if name not in KEYS]
+    combined = table.group_by(KEYS, use_threads=False).aggregate(aggregates)
+    # group_by appends the function to each name; restore the partial names
+    return combined.rename_columns([name.rsplit("_", 1)[0] if name not in KEYS else name
+                                    for name in combined.schema.names])
+
+
+def aggregate_file(path, source, block_bytes=DEFAULT_BLOCK_BYTES, batch_rows=DEFAULT_BATCH_ROWS):
+    """Streams one export and returns (DataFrame of derived inputs per employee_id and period, skipped rows)."""
+    partials = []
+    skipped = 0
+    schema_checked = False
+    for batch in iter_batches(path, source.columns, block_bytes, batch_rows):
+        if not schema_checked:
+            missing = [name for name in ("employee_id", source.timestamp) if name not in batch.schema.names]
+            if missing:
+                raise ValueError(f"{path}: missing required column(s) {', '.join(missing)}")
+            schema_checked = True
+        if len(batch) == 0:
+            continue
+        partial, batch_skipped = reduce_batch(batch, source)
+        partials.append(partial)
+        skipped += batch_skipped
+        if len(partials) >= COMPACT_EVERY:
+            partials = [_combine(partials)]
+    if not partials:
+        return pd.DataFrame(columns=KEYS), skipped
+    frame = _combine(partials).to_pandas()
+    return _to_inputs(frame, source), skipped
+
+
+def _to_inputs(frame, source):
+    """Renames aggregate columns to the KPI input keys they feed."""
+    inputs = frame[KEYS].copy()
+    for name in DETAIL_COLUMNS:
+        if f"{name}_max" in frame:
+            inputs[name] = frame[f"{name}_max"]
+    for key in source.counts:
+        inputs[key] = frame["rows_sum"]
+    for name, (hours_key, count_key) in source.durations.items():
+        if f"{name}_sum" in frame:
+            inputs[hours_key] = frame[f"{name}_sum"].fillna(0).round(2)
+            inputs[count_key] = frame[f"{name}_count"]
+    for name, key in source.flags.items():
+        if f"{name}_sum" in frame:
+            inputs[key] = frame[f"{name}_sum"].fillna(0)
+    for name, (positive_key, total_key) in source.ratings.items():
+        if f"{name}_sum" in frame:
+            inputs[positive_key] = frame[f"{name}_sum"].fillna(0)
+            inputs[total_key] = frame[f"{name}_count"]
+    for key in INPUT_KEYS:
+        if key in inputs and key not in FLOAT_INPUTS:
+            inputs[key] = inputs[key].astype(np.int64)
+    return inputs
+
+
+# --- Merging Into Assessments ---
+def build_assessments(derived_frames, base=None):
+    """Overlays derived inputs onto hand-entered assessments (the batch.py row format).
+
+    `derived_frames` are aggregate_file results; `base` is an optional DataFrame with
+    name, id, manager, period and KPI columns. Derived values win for the inputs they
+    cover; every other input comes from `base`, or is 0 for employees only in the logs.
+    Base values are not validated here, so batch.py and the store still reject bad ones.
+    """
+    derived = pd.DataFrame(columns=KEYS)
+    for frame in derived_frames:
+        if frame.empty:
+            continue
+        if derived.empty:
+            derived = frame
+            continue
+        derived = derived.merge(frame, on=KEYS, how="outer", suffixes=("", "_other"))
+        for name in DETAIL_COLUMNS:
+            if f"{name}_other" in derived:
+                derived[name] = derived[name].fillna(derived.pop(f"{name}_other"))
+    derived = derived.rename(columns={"employee_id": "id", "employee_name": "name"})
+
+    base = pd.DataFrame(columns=["name", "id", "manager", "period"]) if base is None else base.copy()
+    base["id"] = base["id"].astype(str).str.strip()
+    base["period"] = base["period"].astype(str).str.strip()
+    merged = base.merge(derived, on=["id", "period"], how="outer", suffixes=("", "_derived"))
+
+    for column in ["name", "manager"]:
+        if f"{column}_derived" in merged:
+            entered = merged[column].notna() & merged[column].astype(str).str.strip().ne("")
+            merged[column] = merged[column].where(entered, merged.pop(f"{column}_derived"))
+        elif column not in merged:
+            merged[column] = ""
+    for key in INPUT_KEYS:
+        if f"{key}_derived" in merged:
+            derived_values = merged.pop(f"{key}_derived")
+            merged[key] = derived_values.where(derived_values.notna(), merged[key])
+        merged[key] = merged[key].where(merged[key].notna(), 0) if key in merged else 0
+        numbers = pd.to_numeric(merged[key], errors="coerce")
+        if numbers.isna().any():
+            # Keep invalid entries as text so batch.py and the store still reject them
+            merged[key] = merged[key].astype(str)
+        elif key in FLOAT_INPUTS or numbers.mod(1).ne(0).any():
+            merged[key] = numbers
+        else:
+            merged[key] = numbers.astype(np.int64)
+    return merged[["name", "id", "manager", "period"] + INPUT_KEYS].fillna({"name": "", "manager": ""})
+
+
+def run(args):
+    """Imports the exports named in the parsed arguments; raises OSError or ValueError on unusable input."""
+    start = time.perf_counter()
+    derived, skipped, total_bytes = [], 0, 0
+    for path, source in ((args.tickets, TICKETS), (args.incidents, INCIDENTS)):
+        if path:
+            frame, file_skipped = aggregate_file(path, source, block_bytes=args.block_mb * 1024 * 1024)
+            derived.append(frame)
+            skipped += file_skipped
+            total_bytes += os.path.getsize(path)
+            print(f"{source.name}: {len(frame)} employee-periods from {path} ({file_skipped} rows skipped)")
+
+    base = None
+    if args.assessments:
+        from batch import iter_frames
+
+        base = pd.concat(list(iter_frames(args.assessments, chunk_size=100_000)), ignore_index=True)
+    assessments = build_assessments(derived, base)
+
+    if args.out:
+        if args.out.lower().endswith((".parquet", ".pq")):
+            assessments.to_parquet(args.out, index=False)
+        else:
+            assessments.to_csv(args.out, index=False)
+    if args.db:
+        from assessment_store import AssessmentStore, prepare_frame
+
+        store = AssessmentStore(args.db)
+        frame, invalid = prepare_frame(assessments)
+        written = store.bulk_insert(frame)
+        store.close()
+        print(f"Scored {written} assessments into {args.db} ({invalid} invalid rows skipped)")
+
+    elapsed = time.perf_counter() - start
+    print(f"{len(assessments)} assessments from {total_bytes / 1024 / 1024:.1f} MB of exports "
+          f"in {elapsed:.2f}s ({total_bytes / 1024 / 1024 / elapsed:.1f} MB/s)")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Derive Customers and Processes inputs from ticket and incident exports.")
+    parser.add_argument("--tickets", help="Ticket export (CSV, JSON Lines or Parquet), one row per ticket")
+    parser.add_argument("--incidents", help="Incident export (CSV, JSON Lines or Parquet), one row per incident")
+    parser.add_argument("--assessments", help="Hand-entered assessments (batch.py format) to merge into")
+    parser.add_argument("--out", help="Write the merged assessments as CSV or Parquet (readable by batch.py)")
+    parser.add_argument("--db", help="Score the merged assessments into this assessment database")
+    parser.add_argument("--block-mb", type=int, default=DEFAULT_BLOCK_BYTES // (1024 * 1024),
+                        help="CSV/JSON chunk size in MB (default: 1)")
+    args = parser.parse_args(argv)
+    if not (args.tickets or args.incidents):
+        parser.error("give --tickets and/or --incidents")
+    if not (args.out or args.db):
+        parser.error("give --out and/or --db")
+
+    try:
+        return run(args)
+    except (OSError, ValueError) as exc:  # a missing file, a required column or an unreadable export
+        print(f"Import failed: {exc}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
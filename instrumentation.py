@@ -0,0 +1,98 @@
+"""Rerun counters and timings for the Streamlit page, and helpers for its debug panel.
+
+Full script runs are recorded under "script"; fragment runs under their own name.
+A full run also executes every fragment, so its duration includes theirs. While
+tracing is enabled (see tracing.py) reruns also feed the streamlit_rerun_seconds
+histogram.
+"""
+import contextlib
+import cProfile
+import functools
+import io
+import os
+import pstats
+import tempfile
+import threading
+import time
+
+import streamlit as st
+
+from tracing import METRICS, TRACER
+
+# cProfile dumps captured from the debug panel
+PROFILE_DIR = os.environ.get("ASSESSMENT_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "assessment-profiles"))
+
+
+class RerunStats:
+    """Thread-safe count, total and maximum duration of runs, per scope."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._runs = {}
+
+    def record(self, scope, seconds):
+        with self._lock:
+            count, total, longest = self._runs.get(scope, (0, 0.0, 0.0))
+            self._runs[scope] = (count + 1, total + seconds, max(longest, seconds))
+        if TRACER.enabled:
+            METRICS.observe("streamlit_rerun_seconds", seconds, scope=scope)
+
+    def snapshot(self):
+        """Returns {scope: {"count", "mean_ms", "max_ms"}}."""
+        with self._lock:
+            return {scope: {"count": count, "mean_ms": total / count * 1000, "max_ms": longest * 1000}
+                    for scope, (count, total, longest) in self._runs.items()}
+
+
+# Shared by every session in this server process
+RERUN_STATS = RerunStats()
+
+
+def timed_fragment(name, run_every=None):
+    """Decorator turning a function into an st.fragment whose runs are recorded as `name`.
+
+    `run_every` is passed on to st.fragment to rerun the fragment on a timer.
+    """
+    def decorator(func):
+        @st.fragment(run_every=run_every)
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                RERUN_STATS.record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def stage_breakdown(spans, total_seconds):
+    """Turns collected spans into table rows; time outside any span is attributed to Streamlit."""
+    def share(seconds):
+        return f"{seconds / total_seconds:.0%}" if total_seconds else ""
+
+    # Spans finish innermost first; list them in start order, nested ones indented
+    rows = [{"stage": "\u2003" * depth + stage, "ms": round(seconds * 1000, 2), "share": share(seconds)}
+            for stage, seconds, depth, _ in sorted(spans, key=lambda item: item[3])]
+    unattributed = total_seconds - sum(seconds for _, seconds, depth, _ in spans if depth == 0)
+    rows.append({"stage": "streamlit (outside spans)", "ms": round(unattributed * 1000, 2),
+                 "share": share(unattributed)})
+    return rows
+
+
+@contextlib.contextmanager
+def capture_profile(name):
+    """Profiles the block with cProfile; the yielded dict receives the dump's "path" and a "summary"."""
+    profile = {}
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profile
+    finally:
+        profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.prof")
+        profiler.dump_stats(path)
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(20)
+        profile.update(path=path, summary=summary.getvalue())
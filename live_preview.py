@@ -0,0 +1,49 @@
+"""Incrementally maintained score preview for the assessment being edited.
+
+Only the KPIs that read a changed input are recomputed, followed by the categories
+they belong to and the overall score. Values match score_assessment exactly.
+"""
+from scoring import CATEGORIES, KPI_DEPENDENCIES, KPIS, KPIS_BY_CODE, WEIGHTS, kpi_score
+
+_MISSING = object()
+
+
+class LivePreview:
+    """KPI values, category averages and overall score, updated from changed inputs only."""
+
+    def __init__(self):
+        self.inputs = {}
+        self.kpi_scores = {}
+        self.category_averages = {category.lower(): 0 for category in CATEGORIES}
+        self.overall_score = 0
+        self._ratio_codes = {category: [kpi.code for kpi in KPIS if kpi.category == category and kpi.kind == "ratio"]
+                             for category in CATEGORIES}
+
+    def update(self, inputs):
+        """Applies the current input values and returns the categories whose display changed."""
+        changed_keys = [key for key, value in inputs.items() if self.inputs.get(key, _MISSING) != value]
+        if not changed_keys:
+            return set()
+        self.inputs.update((key, inputs[key]) for key in changed_keys)
+
+        dirty_categories = set()
+        for code in {code for key in changed_keys for code in KPI_DEPENDENCIES.get(key, ())}:
+            kpi = KPIS_BY_CODE[code]
+            self.kpi_scores[code] = kpi_score(kpi, {key: self.inputs.get(key, 0) for key in (kpi.num, kpi.den) if key})
+            dirty_categories.add(kpi.category)
+
+        for category in dirty_categories:
+            values = [self.kpi_scores.get(code, 0) for code in self._ratio_codes[category]]
+            self.category_averages[category.lower()] = sum(values) / len(values) if values else 0
+
+        total_weight = sum(WEIGHTS.values())
+        weighted_sum = sum(self.category_averages[name] * weight for name, weight in WEIGHTS.items())
+        self.overall_score = weighted_sum / total_weight if total_weight > 0 else 0
+        return dirty_categories
+
+    def kpi_results(self, category):
+        """Yields (label, formatted result) for every KPI of `category`, in report order."""
+        for kpi in KPIS:
+            if kpi.category == category:
+                r = self.kpi_scores.get(kpi.code, 0)
+                yield kpi.label, kpi.result_fmt.format(a=self.inputs.get(kpi.num, 0), r=r)
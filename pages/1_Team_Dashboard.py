@@ -0,0 +1,78 @@
+import streamlit as st
+import pandas as pd
+
+from assessment_store import CATEGORY_COLUMNS, SCORE_BUCKETS, get_store, period_sort_key
+
+BUCKET_LABELS = [f"{low}-{low + 10}%" for low in range(0, 10 * (SCORE_BUCKETS - 1), 10)] + ["100%+"]
+
+
+def ordered_index(labels, name):
+    """An index the charts keep in the given order; plain string indexes are sorted alphabetically."""
+    return pd.CategoricalIndex(labels, categories=labels, ordered=True, name=name)
+
+
+def distribution_chart(counts):
+    st.bar_chart(pd.DataFrame({"Assessments": counts}, index=ordered_index(BUCKET_LABELS, "Overall score")))
+
+
+# --- Dashboard UI ---
+# Everything below reads the pre-aggregated rollup tables, never the full assessment history
+st.set_page_config(layout="wide", page_title="Team Dashboard")
+st.title("Team Dashboard")
+
+store = get_store()
+periods = store.periods()
+if not periods:
+    st.info("No assessments have been saved yet. Generate a report to start building the dashboard.")
+    st.stop()
+
+period = st.selectbox("Assessment Period", periods, index=len(periods) - 1)
+period_index = periods.index(period)
+# The previous period with data, which is not necessarily the quarter before, so changes
+# are always labelled with it
+previous_period = periods[period_index - 1] if period_index > 0 else None
+change_column = f"change vs {previous_period}"
+
+teams = pd.DataFrame(store.team_rollups(period=period))
+if previous_period:
+    previous = pd.DataFrame(store.team_rollups(period=previous_period))
+    previous = previous[["manager", "overall"]].rename(columns={"overall": "previous_overall"})
+    teams = teams.merge(previous, on="manager", how="left")
+    teams[change_column] = teams["overall"] - teams["previous_overall"]
+    teams = teams.drop(columns="previous_overall")
+teams = teams.drop(columns="period").sort_values("overall", ascending=False)
+
+total = int(teams["assessments"].sum())
+overall = (teams["overall"] * teams["assessments"]).sum() / total
+col1, col2, col3 = st.columns(3)
+col1.metric("Assessments", f"{total:,}")
+col2.metric("Average Overall Score", f"{overall:.1f}%")
+col3.metric("Teams", f"{len(teams):,}")
+
+st.subheader(f"Overall Score Distribution - {period}")
+distribution_chart(store.score_distribution(period))
+
+st.subheader("Category Averages per Manager")
+score_columns = {column: st.column_config.NumberColumn(format="%.1f")
+                 for column in ["overall", change_column] + CATEGORY_COLUMNS if column in teams}
+st.dataframe(teams, column_config=score_columns, hide_index=True, width="stretch")
+
+# --- Manager Detail ---
+st.markdown("---")
+manager = st.selectbox("Manager", sorted(teams["manager"]))
+history = pd.DataFrame(store.team_rollups(manager=manager))
+history = history.sort_values("period", key=lambda periods: periods.map(period_sort_key))
+
+current = history[history["period"] == period].iloc[0]
+previous = history[history["period"] == previous_period] if previous_period else history.iloc[0:0]
+delta = f"{current['overall'] - previous.iloc[0]['overall']:+.1f} pts vs {previous_period}" if len(previous) else None
+st.metric(f"{manager} - Average Overall Score", f"{current['overall']:.1f}%", delta)
+
+col1, col2 = st.columns(2)
+with col1:
+    st.markdown("**Quarter-over-quarter scores**")
+    chart = history[["overall"] + CATEGORY_COLUMNS].set_axis(ordered_index(list(history["period"]), "period"))
+    st.line_chart(chart)
+with col2:
+    st.markdown(f"**Team distribution - {period}**")
+    distribution_chart(store.score_distribution(period, manager))
@@ -0,0 +1,243 @@
+from fpdf import FPDF, XPos, YPos
+import copy
+import datetime
+import functools
+import os
+
+from report_table import KpiTable
+from tracing import span
+
+# --- Branding ---
+LOGO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "MC4 Logo.png")
+LOGO_WIDTH_MM = 20
+
+# --- Output Profiles ---
+# Logo resolution per profile: "print" embeds the logo file as it is, "archive" embeds
+# it pre-scaled to 150 DPI at its printed width. Content streams are deflated in both.
+OUTPUT_PROFILES = {"print": None, "archive": 150}
+DEFAULT_PROFILE = os.environ.get("ASSESSMENT_PDF_PROFILE", "print")
+
+
+@functools.lru_cache(maxsize=None)
+def logo_image(profile=DEFAULT_PROFILE):
+    """Returns the logo to embed for `profile`: the file path, or a pre-scaled image built once."""
+    if profile not in OUTPUT_PROFILES:
+        raise ValueError(f"Unknown output profile {profile!r}; expected one of {', '.join(OUTPUT_PROFILES)}")
+    dpi = OUTPUT_PROFILES[profile]
+    if dpi is None:
+        return LOGO_PATH
+    from PIL import Image
+
+    logo = Image.open(LOGO_PATH)
+    size = round(LOGO_WIDTH_MM / 25.4 * dpi)
+    logo = logo.convert("RGBA").resize((size, round(size * logo.height / logo.width)), Image.LANCZOS)
+    # The logo sits on the white page, so flattening it drops the alpha mask without changing the page
+    flattened = Image.new("RGB", logo.size, "white")
+    flattened.paste(logo, mask=logo.getchannel("A"))
+    return flattened
+
+
+# Shared by create_pdf and ReportTemplate so both keep the wrapped-text caches warm
+_TABLE = KpiTable()
+
+
+# --- PDF Generation Function ---
+# This function creates the PDF report using the FPDF library
+def create_pdf(employee_data, results, overall_score, weights, profile=DEFAULT_PROFILE):
+    """Generates a professional PDF report from assessment data with branding."""
+    pdf = FPDF()
+    pdf.add_page()
+
+    # --- Header with Logo ---
+    if os.path.exists(LOGO_PATH):
+        # Position logo on the top left, with size increased
+        with span("create_pdf.image"):
+            pdf.image(logo_image(profile), x=10, y=8, w=LOGO_WIDTH_MM)
+
+    pdf.set_font("Arial", 'B', 18)
+    # Set text color to dark brown
+    pdf.set_text_color(89, 29, 7)  # Corresponds to #591D07
+    pdf.cell(0, 10, "Employee Assessment Report", 0, 1, 'C')
+    pdf.set_text_color(0, 0, 0)  # Reset to black
+    pdf.ln(10)  # Reduced vertical space
+
+    # --- Employee Information Table (Two Columns) ---
+    col1_width = 95
+    col2_x_start = 10 + col1_width
+
+    # Row 1: Name and Period
+    pdf.set_font("Arial", 'B', 11)
+    pdf.cell(50, 8, "Employee Name:", 0, 0)
+    pdf.set_font("Arial", '', 11)
+    pdf.cell(col1_width - 50, 8, employee_data['name'], 0, 0)
+
+    pdf.set_x(col2_x_start)
+    pdf.set_font("Arial", 'B', 11)
+    pdf.cell(50, 8, "Assessment Period:", 0, 0)
+    pdf.set_font("Arial", '', 11)
+    pdf.cell(0, 8, employee_data['period'], 0, 1)
+
+    # Row 2: ID and Date
+    pdf.set_font("Arial", 'B', 11)
+    pdf.cell(50, 8, "Employee ID Number:", 0, 0)
+    pdf.set_font("Arial", '', 11)
+    pdf.cell(col1_width - 50, 8, employee_data['id'], 0, 0)
+
+    pdf.set_x(col2_x_start)
+    pdf.set_font("Arial", 'B', 11)
+    pdf.cell(50, 8, "Date of Generation:", 0, 0)
+    pdf.set_font("Arial", '', 11)
+    pdf.cell(0, 8, datetime.date.today().strftime("%B %d, %Y"), 0, 1)
+
+    # Row 3: Manager and Score
+    pdf.set_font("Arial", 'B', 11)
+    pdf.cell(50, 8, "Manager Name:", 0, 0)
+    pdf.set_font("Arial", '', 11)
+    pdf.cell(col1_width - 50, 8, employee_data['manager'], 0, 0)
+
+    pdf.set_x(col2_x_start)
+    pdf.set_font("Arial", 'B', 12)
+    pdf.cell(50, 8, "Overall Score:", 0, 0)
+    pdf.set_font("Arial", 'B', 12)
+    pdf.set_text_color(89, 29, 7)
+    pdf.cell(0, 8, f"{overall_score:.1f}%", 0, 1)
+    pdf.set_text_color(0, 0, 0)  # Reset color
+
+    pdf.ln(10)  # Space after the info block
+
+    # --- Results Section ---
+    pdf.set_font("Arial", 'B', 14)
+    pdf.cell(0, 10, "Assessment Results", 0, 1, 'L')
+
+    # Table header with brand colors, then a band per category and a row per KPI
+    _TABLE.draw_header(pdf)
+    _TABLE.draw_rows(pdf, results, weights)
+
+    # --- Signature Section ---
+    pdf.ln(12)  # Reduced vertical space
+    pdf.set_font("Arial", '', 12)
+    pdf.cell(95, 10, "_____________________________", 0, 0, 'L')
+    pdf.cell(95, 10, "_____________________________", 0, 1, 'L')
+    pdf.cell(95, 6, "Employee Signature", 0, 0, 'L')
+    pdf.cell(95, 6, "Direct Manager Signature", 0, 1, 'L')
+
+    with span("create_pdf.output"):
+        return pdf.output(dest='S')
+
+
+# --- Report Template ---
+# Bump whenever the rendered layout changes so cached reports are not re-used
+TEMPLATE_VERSION = 3
+# Per-process templates used by get_template(), one per output profile; built on first use
+_TEMPLATES = {}
+
+
+class ReportTemplate:
+    """A report page whose static parts are laid out once and re-used for every employee.
+
+    The logo, title, field labels and results table header are drawn into a template
+    document when the template is built. render() copies that document and stamps only
+    the employee fields, KPI rows and signature block, so the logo is decoded and
+    compressed once per process instead of once per report.
+    """
+
+    def __init__(self, profile=DEFAULT_PROFILE):
+        self.profile = profile
+        self._pdf = FPDF()
+        self._pdf.add_page()
+        self._slots = self._draw_static(self._pdf)
+        self._table_y = self._pdf.get_y()
+
+    def _draw_static(self, pdf):
+        """Draws everything that does not depend on the employee; returns the value slots."""
+        if os.path.exists(LOGO_PATH):
+            pdf.image(logo_image(self.profile), x=10, y=8, w=LOGO_WIDTH_MM)
+
+        pdf.set_font("Helvetica", 'B', 18)
+        pdf.set_text_color(89, 29, 7)  # Corresponds to #591D07
+        pdf.cell(0, 10, "Employee Assessment Report", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+        pdf.set_text_color(0, 0, 0)
+        pdf.ln(10)
+
+        # Two-column info block: each label is followed by an empty slot for its value
+        col1_width = 95
+        col2_x_start = 10 + col1_width
+        rows = (("Employee Name:", "name", "Assessment Period:", "period"),
+                ("Employee ID Number:", "id", "Date of Generation:", "date"),
+                ("Manager Name:", "manager", "Overall Score:", "score"))
+        slots = {}
+        for left_label, left_slot, right_label, right_slot in rows:
+            y = pdf.get_y()
+            pdf.set_font("Helvetica", 'B', 11)
+            pdf.cell(50, 8, left_label)
+            slots[left_slot] = (pdf.get_x(), y, col1_width - 50)
+
+            pdf.set_x(col2_x_start)
+            pdf.set_font("Helvetica", 'B', 12 if right_slot == "score" else 11)
+            pdf.cell(50, 8, right_label)
+            slots[right_slot] = (pdf.get_x(), y, 0)
+            pdf.set_xy(pdf.l_margin, y + 8)
+
+        pdf.ln(10)
+
+        pdf.set_font("Helvetica", 'B', 14)
+        pdf.cell(0, 10, "Assessment Results", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='L')
+
+        _TABLE.draw_header(pdf)
+        return slots
+
+    def _stamp_fields(self, pdf, employee_data, overall_score, generated_on):
+        values = {"name": employee_data['name'], "period": employee_data['period'], "id": employee_data['id'],
+                  "date": generated_on.strftime("%B %d, %Y"), "manager": employee_data['manager']}
+        pdf.set_font("Helvetica", '', 11)
+        for slot, text in values.items():
+            x, y, w = self._slots[slot]
+            pdf.set_xy(x, y)
+            pdf.cell(w, 8, text)
+
+        x, y, w = self._slots["score"]
+        pdf.set_xy(x, y)
+        pdf.set_font("Helvetica", 'B', 12)
+        pdf.set_text_color(89, 29, 7)
+        pdf.cell(w, 8, f"{overall_score:.1f}%")
+        pdf.set_text_color(0, 0, 0)
+
+    def _draw_rows(self, pdf, results, weights):
+        pdf.set_xy(pdf.l_margin, self._table_y)
+        _TABLE.draw_rows(pdf, results, weights)
+
+    @staticmethod
+    def _draw_signatures(pdf):
+        pdf.ln(12)
+        pdf.set_font("Helvetica", '', 12)
+        pdf.cell(95, 10, "_____________________________", align='L')
+        pdf.cell(95, 10, "_____________________________", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='L')
+        pdf.cell(95, 6, "Employee Signature", align='L')
+        pdf.cell(95, 6, "Direct Manager Signature", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='L')
+
+    def render_document(self, employee_data, results, overall_score, weights, generated_on=None):
+        """Lays out one report and returns the unfinished FPDF document (output() not called yet)."""
+        with span("report.layout"):
+            pdf = copy.deepcopy(self._pdf)
+            self._stamp_fields(pdf, employee_data, overall_score, generated_on or datetime.date.today())
+            self._draw_rows(pdf, results, weights)
+            self._draw_signatures(pdf)
+        return pdf
+
+    def render(self, employee_data, results, overall_score, weights, generated_on=None):
+        """Renders one report; takes the same arguments as create_pdf and returns the PDF bytes.
+
+        `generated_on` is the date printed as "Date of Generation" (default: today).
+        """
+        pdf = self.render_document(employee_data, results, overall_score, weights, generated_on)
+        with span("report.output"):
+            return pdf.output()
+
+
+def get_template(profile=DEFAULT_PROFILE):
+    """Returns this process's ReportTemplate for `profile`, building it on first use."""
+    template = _TEMPLATES.get(profile)
+    if template is None:
+        with span("report.template_build"):
+            template = _TEMPLATES[profile] = ReportTemplate(profile)
+    return template
@@ -0,0 +1,256 @@
+"""Headless HTTP API for assessment reports, served by Tornado.
+
+    python report_api.py --port 8502 --workers 4
+
+POST /reports with {"employee": {"name", "id", "manager", "period"}, "inputs": {KPI
+widget keys such as "f1_comp": 3}} returns the PDF; add ?format=json (or send
+"Accept: application/json") for a score summary instead. POST /reports/batch with
+{"assessments": [...]} returns a ZIP with one PDF per employee, or a JSON list of
+summaries. Scoring and rendering run on a process pool so the event loop only parses,
+validates and answers. GET /metrics exposes the Prometheus text metrics and
+GET /health answers "ok".
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import datetime
+import io
+import json
+import math
+import os
+import signal
+import time
+import zipfile
+
+import tornado.httpserver
+import tornado.web
+
+from batch import report_filename, unique_filename
+from report import get_template
+from report_cache import ReportCache, report_key
+from scoring import INPUT_KEYS, WEIGHTS, coerce_employee, coerce_inputs, score_assessment
+from tracing import METRICS
+
+DEFAULT_PORT = 8502
+DEFAULT_MAX_BATCH = 500
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+METRICS.describe("api_request_seconds", "Report API request latency by endpoint.")
+METRICS.describe("api_requests_total", "Report API requests by endpoint and status code.")
+
+
+# --- Worker Functions (run in the process pool) ---
+# Errors leave the workers as RuntimeError: an exception that cannot be unpickled in the
+# server process (such as fpdf's FPDFUnicodeEncodingException) marks the whole pool broken
+def summarize(employee_data, inputs):
+    """Scores one assessment into the JSON summary returned by ?format=json."""
+    try:
+        results, category_averages, overall_score = score_assessment(inputs)
+    except Exception as exc:
+        raise RuntimeError(f"{type(exc).__name__}: {exc}") from None
+    return {"employee": employee_data, "overall_score": overall_score,
+            "category_scores": category_averages, "kpis": results}
+
+
+def render(employee_data, inputs, generated_on):
+    """Scores and renders one assessment; returns the PDF bytes."""
+    try:
+        results, _, overall_score = score_assessment(inputs)
+        return bytes(get_template().render(employee_data, results, overall_score, WEIGHTS, generated_on))
+    except Exception as exc:
+        raise RuntimeError(f"{type(exc).__name__}: {exc}") from None
+
+
+# --- Validation ---
+def parse_assessment(payload):
+    """Validates one {"employee", "inputs"} object; returns (employee_data, inputs) or raises ValueError."""
+    if not isinstance(payload, dict):
+        raise ValueError("expected a JSON object with 'employee' and 'inputs'")
+    employee, inputs = payload.get("employee"), payload.get("inputs", {})
+    if not isinstance(employee, dict):
+        raise ValueError("employee: expected an object with name, id, manager and period")
+    if not isinstance(inputs, dict):
+        raise ValueError("inputs: expected an object of KPI values")
+    # Unknown keys would otherwise be ignored and the intended KPI silently scored as 0
+    unknown = sorted(set(inputs) - set(INPUT_KEYS))
+    if unknown:
+        raise ValueError(f"inputs: unknown keys {', '.join(unknown)}")
+    for key, value in inputs.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError(f"{key}: {value!r} is not a number")
+        # json.loads accepts NaN and Infinity; coerce_inputs would read NaN as a blank, i.e. 0
+        if isinstance(value, float) and not math.isfinite(value):
+            raise ValueError(f"{key}: {value!r} is not a finite number")
+    return coerce_employee(employee), coerce_inputs(inputs)
+
+
+# --- Handlers ---
+class BaseHandler(tornado.web.RequestHandler):
+    endpoint = None
+
+    def initialize(self, app_state):
+        self.state = app_state
+        self._start = time.perf_counter()
+
+    def on_finish(self):
+        METRICS.observe("api_request_seconds", time.perf_counter() - self._start, endpoint=self.endpoint)
+        METRICS.count("api_requests_total", endpoint=self.endpoint, status=self.get_status())
+
+    def write_error(self, status_code, **kwargs):
+        message = self._reason
+        if "exc_info" in kwargs and isinstance(kwargs["exc_info"][1], tornado.web.HTTPError):
+            message = kwargs["exc_info"][1].log_message or message
+        self.finish({"error": message})
+
+    def json_body(self):
+        try:
+            return json.loads(self.request.body)
+        except ValueError as exc:
+            raise tornado.web.HTTPError(400, f"invalid JSON: {exc}")
+
+    def wants_json(self):
+        requested = self.get_query_argument("format", None)
+        if requested is not None:
+            if requested not in ("pdf", "json"):
+                raise tornado.web.HTTPError(400, "format must be 'pdf' or 'json'")
+            return requested == "json"
+        return "application/json" in self.request.headers.get("Accept", "")
+
+    async def run(self, func, *args):
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.state["pool"], func, *args)
+        except RuntimeError as exc:  # raised by the worker functions, or a broken pool
+            raise tornado.web.HTTPError(500, f"report failed: {exc}")
+
+    async def pdf(self, employee_data, inputs, generated_on):
+        """Returns the PDF from the shared cache, rendering it on the pool on a miss."""
+        key = report_key(employee_data, inputs, WEIGHTS, generated_on)
+        pdf_bytes = self.state["cache"].get(key)
+        METRICS.count("report_cache_total", outcome="miss" if pdf_bytes is None else "hit")
+        if pdf_bytes is None:
+            pdf_bytes = await self.run(render, employee_data, inputs, generated_on)
+            self.state["cache"].put(key, pdf_bytes)
+        return pdf_bytes
+
+
+class ReportHandler(BaseHandler):
+    endpoint = "report"
+
+    async def post(self):
+        try:
+            employee_data, inputs = parse_assessment(self.json_body())
+        except ValueError as exc:
+            raise tornado.web.HTTPError(400, str(exc))
+
+        if self.wants_json():
+            self.finish(await self.run(summarize, employee_data, inputs))
+            return
+        pdf_bytes = await self.pdf(employee_data, inputs, datetime.date.today())
+        self.set_header("Content-Type", "application/pdf")
+        self.set_header("Content-Disposition", f'attachment; filename="{report_filename(employee_data)}"')
+        self.finish(pdf_bytes)
+
+
+class BatchHandler(BaseHandler):
+    endpoint = "batch"
+
+    async def post(self):
+        body = self.json_body()
+        assessments = body.get("assessments") if isinstance(body, dict) else None
+        if not isinstance(assessments, list) or not assessments:
+            raise tornado.web.HTTPError(400, "expected {'assessments': [...]} with at least one item")
+        if len(assessments) > self.state["max_batch"]:
+            raise tornado.web.HTTPError(400, f"at most {self.state['max_batch']} assessments per batch")
+
+        parsed, errors = [], []
+        for index, payload in enumerate(assessments):
+            try:
+                parsed.append(parse_assessment(payload))
+            except ValueError as exc:
+                errors.append({"index": index, "error": str(exc)})
+        if errors:
+            self.set_status(400)
+            self.finish({"error": "invalid assessments", "errors": errors})
+            return
+
+        if self.wants_json():
+            summaries = await asyncio.gather(*(self.run(summarize, *item) for item in parsed))
+            self.finish({"reports": summaries})
+            return
+
+        generated_on = datetime.date.today()
+        reports = await asyncio.gather(*(self.pdf(employee_data, inputs, generated_on)
+                                         for employee_data, inputs in parsed))
+        archive = await asyncio.get_running_loop().run_in_executor(
+            None, build_zip, [report_filename(employee_data) for employee_data, _ in parsed], reports)
+        self.set_header("Content-Type", "application/zip")
+        self.set_header("Content-Disposition", 'attachment; filename="assessment_reports.zip"')
+        self.finish(archive)
+
+
+def build_zip(names, reports):
+    buffer = io.BytesIO()
+    taken = set()
+    # PDF content is already deflated, so members are stored as-is
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as archive:
+        for name, pdf_bytes in zip(names, reports):
+            archive.writestr(unique_filename(name, taken), pdf_bytes)
+    return buffer.getvalue()
+
+
+class MetricsHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.set_header("Content-Type", "text/plain; version=0.0.4")
+        self.finish(METRICS.render())
+
+
+class HealthHandler(tornado.web.RequestHandler):
+    def get(self):
+        self.finish("ok")
+
+
+def make_app(pool, cache=None, max_batch=DEFAULT_MAX_BATCH):
+    """Builds the Tornado application around a worker pool and a shared ReportCache."""
+    state = {"pool": pool, "cache": cache or ReportCache(), "max_batch": max_batch}
+    return tornado.web.Application([
+        (r"/reports", ReportHandler, {"app_state": state}),
+        (r"/reports/batch", BatchHandler, {"app_state": state}),
+        (r"/metrics", MetricsHandler),
+        (r"/health", HealthHandler),
+    ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve assessment reports over HTTP.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--address", default="127.0.0.1", help="Address to bind (default: 127.0.0.1)")
+    parser.add_argument("--workers", type=int, default=None, help="Render processes (default: CPU count)")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH,
+                        help=f"Most assessments per batch request (default: {DEFAULT_MAX_BATCH})")
+    args = parser.parse_args(argv)
+
+    asyncio.run(serve(args))
+
+
+async def serve(args):
+    workers = args.workers or os.cpu_count() or 1
+    # Each worker builds its report template once, before the first request reaches it
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=get_template) as pool:
+        # Start the workers now rather than on the first request
+        await asyncio.gather(*(asyncio.get_running_loop().run_in_executor(pool, os.getpid) for _ in range(workers)))
+        server = tornado.httpserver.HTTPServer(make_app(pool, max_batch=args.max_batch),
+                                               max_body_size=MAX_BODY_BYTES)
+        server.listen(args.port, address=args.address)
+        print(f"Report API listening on http://{args.address}:{args.port} with {workers} workers", flush=True)
+        stopped = asyncio.Event()
+        try:
+            # Stop cleanly on SIGTERM so the pool shuts its workers down too
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopped.set)
+        except NotImplementedError:  # Windows
+            pass
+        await stopped.wait()
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
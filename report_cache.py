@@ -0,0 +1,173 @@
+"""Content-addressed cache of rendered assessment PDFs.
+
+Reports are keyed on a stable hash of everything that affects the document: the
+employee details, every KPI input, the category weights, the template version and
+the generation date. Date policy: the printed "Date of Generation" is part of the
+key, so a cached PDF is only re-used on the day it was generated and a stale date is
+never served.
+"""
+from collections import OrderedDict
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+from scoring import INPUT_KEYS, WEIGHTS, score_assessment
+from tracing import METRICS, span
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Keys include the generation date, so a report on disk is never hit again after a day
+DEFAULT_DISK_MAX_AGE = 24 * 60 * 60
+# How often put() sweeps the disk tier for expired reports
+DISK_PRUNE_INTERVAL = 60 * 60
+
+
+def report_key(employee_data, inputs, weights, generated_on):
+    """Returns the hex digest identifying one rendered report."""
+    # report loads fpdf; importing it here keeps it out of the app's cold start
+    from report import DEFAULT_PROFILE, TEMPLATE_VERSION
+
+    payload = {
+        "employee": {field: str(value) for field, value in employee_data.items()},
+        "inputs": {key: inputs[key] for key in INPUT_KEYS},
+        "weights": weights,
+        "template": TEMPLATE_VERSION,
+        "profile": DEFAULT_PROFILE,
+        "date": generated_on.isoformat(),
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ReportCache:
+    """Thread-safe LRU cache of PDF bytes with a byte-size limit and an optional on-disk tier.
+
+    The memory tier evicts least recently used reports once `max_bytes` is exceeded.
+    When `disk_dir` is set every report is also written there, and memory misses are
+    served from disk (and promoted back into memory). Files older than `disk_max_age`
+    seconds are deleted at startup and then at most every DISK_PRUNE_INTERVAL on put.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, disk_dir=None, disk_max_age=DEFAULT_DISK_MAX_AGE):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_age = disk_max_age
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        self._next_prune = 0.0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self.prune_disk()
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key[:2], f"{key}.pdf")
+
+    def _store(self, key, data):
+        # Caller holds the lock
+        if key in self._entries:
+            self._size -= len(self._entries.pop(key))
+        if len(data) > self.max_bytes:
+            return
+        self._entries[key] = data
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self.evictions += 1
+
+    def get(self, key):
+        """Returns the cached PDF bytes for `key`, or None."""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(key), "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                pass
+            else:
+                with self._lock:
+                    self._store(key, data)
+                    self.disk_hits += 1
+                return data
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, data):
+        """Stores PDF bytes under `key` in memory and, if configured, on disk."""
+        data = bytes(data)
+        with self._lock:
+            self._store(key, data)
+
+        if self.disk_dir:
+            path = self._disk_path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first so concurrent readers never see a partial PDF
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            if time.time() >= self._next_prune:
+                self.prune_disk()
+
+    def prune_disk(self):
+        """Deletes disk-tier files older than `disk_max_age`; returns how many were removed."""
+        now = time.time()
+        with self._lock:
+            self._next_prune = now + DISK_PRUNE_INTERVAL
+        removed = 0
+        # Also catches .tmp files left behind by a crash mid-write
+        for root, _, names in os.walk(self.disk_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    if now - os.path.getmtime(path) > self.disk_max_age:
+                        os.remove(path)
+                        removed += 1
+                except FileNotFoundError:  # pruned by another thread or process
+                    pass
+        with self._lock:
+            self.disk_evictions += removed
+        return removed
+
+    def stats(self):
+        """Returns the hit/miss/eviction counters and current memory usage."""
+        with self._lock:
+            return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                    "evictions": self.evictions, "disk_evictions": self.disk_evictions,
+                    "entries": len(self._entries), "bytes": self._size}
+
+
+def cached_report(cache, employee_data, inputs, weights=WEIGHTS, generated_on=None):
+    """Returns the PDF for an assessment, scoring and rendering it only on a cache miss."""
+    generated_on = generated_on or datetime.date.today()
+    key = report_key(employee_data, inputs, weights, generated_on)
+    with span("report.cache_lookup"):
+        pdf_bytes = cache.get(key)
+    METRICS.count("report_cache_total", outcome="miss" if pdf_bytes is None else "hit")
+    if pdf_bytes is None:
+        with span("report.score"):
+            results, _, overall_score = score_assessment(inputs)
+        with span("report.render"):
+            from report import get_template
+
+            pdf_bytes = get_template().render(employee_data, results, overall_score, weights, generated_on)
+        with span("report.cache_store"):
+            cache.put(key, pdf_bytes)
+    return pdf_bytes
@@ -0,0 +1,286 @@
+"""Multi-employee report packs: one merged PDF, or a ZIP with one PDF per employee.
+
+Both writers take an iterable of (employee_data, inputs) assessments and write each
+report as soon as it is rendered, so memory stays flat however many employees the
+pack holds. The merged PDF shares one copy of the fonts and logo between all pages;
+only the byte offset of every object is kept until the cross-reference table is
+written at the end. A ZIP likewise keeps one small entry per member for its central
+directory.
+
+    python report_pack.py department.csv --out department.pdf
+    python report_pack.py department.parquet --out department.zip
+"""
+from array import array
+import argparse
+import datetime
+import re
+import sys
+import time
+import zipfile
+import zlib
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from batch import DEFAULT_CHUNK_SIZE, iter_chunks, report_filename, unique_filename
+from report import DEFAULT_PROFILE, OUTPUT_PROFILES, get_template
+from scoring import WEIGHTS, coerce_employee, coerce_inputs, score_assessment
+
+_RESOURCE_NAME = re.compile(rb"/([FI]\d+) (?:[\d.]+ Tf|Do)")
+
+
+def _pdf_string(text):
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+class StreamingPdfWriter:
+    """Writes the pages of rendered FPDF documents into one PDF on a binary stream.
+
+    Works on non-seekable streams (sockets, HTTP responses): positions are counted
+    rather than queried. Every page refers to one shared resource dictionary, so all
+    documents must use the same core fonts and images, which holds for reports
+    rendered from the ReportTemplate.
+    """
+
+    # Objects 1-3 are reserved and written last, once every page is known
+    CATALOG, PAGES, RESOURCES = 1, 2, 3
+
+    def __init__(self, stream, title=None):
+        self._stream = stream
+        self._position = 0
+        # Byte offset per object number (index 0 is the free-list head); the only state that grows
+        self._offsets = array("Q", [0, 0, 0, 0])
+        self._kids = array("Q")
+        self._fonts = {}   # resource name -> (base font, object number)
+        self._images = {}  # resource name -> (image cache key, object number)
+        self._title = title
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    @property
+    def page_count(self):
+        return len(self._kids)
+
+    def _write(self, data):
+        self._stream.write(data)
+        self._position += len(data)
+
+    def _allocate(self):
+        self._offsets.append(0)
+        return len(self._offsets) - 1
+
+    def _write_object(self, number, dictionary, stream=None):
+        self._offsets[number] = self._position
+        if stream is None:
+            self._write(f"{number} 0 obj\n{dictionary}\nendobj\n".encode("latin-1"))
+        else:
+            self._write(f"{number} 0 obj\n<<{dictionary} /Length {len(stream)}>>\nstream\n".encode("latin-1"))
+            self._write(stream)
+            self._write(b"\nendstream\nendobj\n")
+
+    def _register_font(self, name, font):
+        known = self._fonts.get(name)
+        if known is not None:
+            if known[0] != font.name:
+                raise ValueError(f"/{name} is {font.name} here but {known[0]} earlier in the pack")
+            return
+        number = self._allocate()
+        self._write_object(number, f"<</Type /Font /Subtype /Type1 /BaseFont /{font.name} "
+                                   f"/Encoding /WinAnsiEncoding>>")
+        self._fonts[name] = (font.name, number)
+
+    def _register_image(self, name, key, info):
+        known = self._images.get(name)
+        if known is not None:
+            if known[0] != key:
+                raise ValueError(f"/{name} is {key} here but {known[0]} earlier in the pack")
+            return
+        smask = ""
+        if info.get("smask"):
+            smask_number = self._allocate()
+            self._write_object(
+                smask_number,
+                f"/Type /XObject /Subtype /Image /Width {info['w']} /Height {info['h']} "
+                f"/ColorSpace /DeviceGray /BitsPerComponent 8 /Filter /FlateDecode "
+                f"/DecodeParms <</Predictor 15 /Colors 1 /Columns {info['w']} /BitsPerComponent 8>>",
+                info["smask"])
+            smask = f" /SMask {smask_number} 0 R"
+        number = self._allocate()
+        self._write_object(
+            number,
+            f"/Type /XObject /Subtype /Image /Width {info['w']} /Height {info['h']} "
+            f"/ColorSpace /{info['cs']} /BitsPerComponent {info['bpc']} /Filter /{info['f']} "
+            f"/DecodeParms <<{info['dp']} /BitsPerComponent {info['bpc']}>>{smask}",
+            info["data"])
+        self._images[name] = (key, number)
+
+    def add_document(self, pdf):
+        """Appends every page of an FPDF document that has not been output() yet."""
+        fonts = {f"F{font.i}": font for font in pdf.fonts.values()}
+        images = {f"I{info['i']}": (key, info) for key, info in pdf.image_cache.images.items()}
+        for page in pdf.pages.values():
+            contents = bytes(page.contents)
+            for name in set(_RESOURCE_NAME.findall(contents)):
+                name = name.decode("ascii")
+                if name in fonts:
+                    self._register_font(name, fonts[name])
+                elif name in images:
+                    self._register_image(name, *images[name])
+                else:
+                    raise ValueError(f"Page refers to unknown resource /{name}")
+
+            content_number = self._allocate()
+            self._write_object(content_number, " /Filter /FlateDecode", zlib.compress(contents))
+            width, height = page.dimensions()
+            page_number = self._allocate()
+            self._write_object(page_number, f"<</Type /Page /Parent {self.PAGES} 0 R "
+                                            f"/MediaBox [0 0 {width:.2f} {height:.2f}] "
+                                            f"/Resources {self.RESOURCES} 0 R /Contents {content_number} 0 R>>")
+            self._kids.append(page_number)
+
+    def close(self):
+        """Writes the shared resources, the page tree, the cross-reference table and the trailer."""
+        fonts = " ".join(f"/{name} {number} 0 R" for name, (_, number) in sorted(self._fonts.items()))
+        images = " ".join(f"/{name} {number} 0 R" for name, (_, number) in sorted(self._images.items()))
+        self._write_object(self.RESOURCES, f"<</ProcSet [/PDF /Text /ImageB /ImageC /ImageI] "
+                                           f"/Font <<{fonts}>> /XObject <<{images}>>>>")
+        self._offsets[self.PAGES] = self._position
+        self._write(f"{self.PAGES} 0 obj\n<</Type /Pages /Count {len(self._kids)} /Kids [".encode("ascii"))
+        for first in range(0, len(self._kids), 1024):
+            self._write("".join(f"{number} 0 R " for number in self._kids[first:first + 1024]).encode("ascii"))
+        self._write(b"]>>\nendobj\n")
+        self._write_object(self.CATALOG, f"<</Type /Catalog /Pages {self.PAGES} 0 R>>")
+
+        info = ""
+        if self._title:
+            info_number = self._allocate()
+            self._write_object(info_number, f"<</Title {_pdf_string(self._title)} /Producer (Employee Assessment)>>")
+            info = f" /Info {info_number} 0 R"
+
+        xref_position = self._position
+        size = len(self._offsets)
+        self._write(f"xref\n0 {size}\n0000000000 65535 f \n".encode("ascii"))
+        for first in range(1, size, 1024):
+            self._write("".join(f"{offset:010d} 00000 n \n"
+                                for offset in self._offsets[first:first + 1024]).encode("ascii"))
+        self._write(f"trailer\n<</Size {size} /Root {self.CATALOG} 0 R{info}>>\n"
+                    f"startxref\n{xref_position}\n%%EOF\n".encode("ascii"))
+
+
+# --- Pack API ---
+def _open(target):
+    # Accept a path or an already open binary stream
+    if isinstance(target, (str, bytes)) or hasattr(target, "__fspath__"):
+        return open(target, "wb"), True
+    return target, False
+
+
+def _render_documents(assessments, weights, generated_on, profile, failures):
+    template = get_template(profile)
+    for employee_data, inputs in assessments:
+        try:
+            results, _, overall_score = score_assessment(inputs)
+            pdf = template.render_document(employee_data, results, overall_score, weights, generated_on)
+        except Exception as exc:  # a bad report must not cut the stream short
+            if failures is None:
+                raise
+            failures.append((employee_data, f"{type(exc).__name__}: {exc}"))
+            continue
+        yield employee_data, pdf
+
+
+def write_pack(assessments, target, weights=WEIGHTS, generated_on=None, title=None, profile=DEFAULT_PROFILE,
+               failures=None):
+    """Writes the reports of (employee_data, inputs) assessments as one merged PDF.
+
+    `target` is a path or a writable binary stream. Returns the number of reports. If
+    `failures` is a list, reports that fail to render are left out and appended to it as
+    (employee_data, message); otherwise the error is raised.
+    """
+    stream, owned = _open(target)
+    try:
+        writer = StreamingPdfWriter(stream, title=title)
+        reports = 0
+        for _, pdf in _render_documents(assessments, weights, generated_on or datetime.date.today(), profile,
+                                        failures):
+            writer.add_document(pdf)
+            reports += 1
+        writer.close()
+    finally:
+        if owned:
+            stream.close()
+    return reports
+
+
+def write_zip(assessments, target, weights=WEIGHTS, generated_on=None, profile=DEFAULT_PROFILE, failures=None):
+    """Writes the reports of (employee_data, inputs) assessments into a ZIP, one PDF per employee.
+
+    `target` is a path or a writable binary stream. Returns the number of reports.
+    `failures` works as in write_pack.
+    """
+    stream, owned = _open(target)
+    reports = 0
+    names = set()
+    try:
+        # PDF content is already deflated, so members are stored as-is
+        with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_STORED) as archive:
+            for employee_data, pdf in _render_documents(assessments, weights, generated_on or datetime.date.today(),
+                                                        profile, failures):
+                archive.writestr(unique_filename(report_filename(employee_data), names), bytes(pdf.output()))
+                reports += 1
+    finally:
+        if owned:
+            stream.close()
+    return reports
+
+
+def iter_assessments(path, errors, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yields (employee_data, inputs) per valid row of a CSV or Parquet file.
+
+    Invalid rows are skipped and appended to `errors` as (row_number, message).
+    """
+    row_number = 0
+    for rows in iter_chunks(path, chunk_size):
+        for row in rows:
+            row_number += 1
+            try:
+                yield coerce_employee(row), coerce_inputs(row)
+            except ValueError as exc:
+                errors.append((row_number, f"{type(exc).__name__}: {exc}"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a department's assessments as one merged PDF or a ZIP.")
+    parser.add_argument("input", help="CSV or Parquet file with one row per employee")
+    parser.add_argument("--out", required=True, help="Output file; a .zip name writes an archive, anything else a PDF")
+    parser.add_argument("--title", default=None, help="Document title of the merged PDF")
+    parser.add_argument("--profile", choices=sorted(OUTPUT_PROFILES), default=DEFAULT_PROFILE,
+                        help=f"PDF output profile; archive embeds a smaller logo (default: {DEFAULT_PROFILE})")
+    args = parser.parse_args(argv)
+
+    errors, failures = [], []
+    assessments = iter_assessments(args.input, errors)
+    start = time.perf_counter()
+    if args.out.lower().endswith(".zip"):
+        written = write_zip(assessments, args.out, profile=args.profile, failures=failures)
+    else:
+        written = write_pack(assessments, args.out, title=args.title, profile=args.profile, failures=failures)
+    elapsed = time.perf_counter() - start
+
+    for row_number, message in errors:
+        print(f"Row {row_number} skipped: {message}", file=sys.stderr)
+    for employee_data, message in failures:
+        print(f"Employee {employee_data['id']} ({employee_data['period']}) skipped: {message}", file=sys.stderr)
+    rate = written / elapsed if elapsed > 0 else 0
+    peak = ""
+    if resource is not None:
+        # ru_maxrss is in kilobytes on Linux
+        peak = f", peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB"
+    print(f"Wrote {written} reports to {args.out} ({len(errors) + len(failures)} rows skipped) "
+          f"in {elapsed:.2f}s - {rate:.1f} reports/second{peak}")
+    return 1 if errors or failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
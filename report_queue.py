@@ -0,0 +1,155 @@
+"""Background queue for report rendering.
+
+Sessions submit a job and poll it instead of rendering in their script thread. The
+queue is bounded: once `max_depth` jobs are queued or running, submit() raises
+QueueFull. A session that submits the same report again while its job is pending
+gets the pending job back instead of a second one. Every job records how long it
+waited for a worker and how long it rendered, as report_queue_seconds{phase=...}.
+"""
+import itertools
+import threading
+import time
+
+from scoring import score_assessment
+from tracing import METRICS, write_metrics_file
+
+DEFAULT_MAX_DEPTH = 32
+# Finished jobs nobody collected (e.g. the tab was closed) are dropped after this long
+DEFAULT_RESULT_TTL_SECONDS = 10 * 60
+
+METRICS.describe("report_queue_seconds", "Time report jobs spent waiting for a worker and rendering.")
+METRICS.describe("report_jobs_total", "Report jobs by outcome.")
+
+
+class QueueFull(Exception):
+    """Raised by ReportQueue.submit when the maximum queue depth is reached."""
+
+
+def render_job(employee_data, inputs, weights, generated_on):
+    """Worker entry point: scores and renders one report.
+
+    Returns (pdf_bytes, started_at, render_seconds), with started_at as wall-clock time so
+    it can be compared with the submit time across processes.
+    """
+    # Loaded by the first job rather than with the app, since report imports fpdf
+    from report import get_template
+
+    started_at = time.time()
+    start = time.perf_counter()
+    results, _, overall_score = score_assessment(inputs)
+    pdf_bytes = bytes(get_template().render(employee_data, results, overall_score, weights, generated_on))
+    return pdf_bytes, started_at, time.perf_counter() - start
+
+
+class ReportJob:
+    """One submitted report; `state` is "queued", "running", "done" or "failed"."""
+
+    def __init__(self, job_id, session_id, key, future):
+        self.id = job_id
+        self.session_id = session_id
+        self.key = key
+        self.future = future
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self.pdf_bytes = None
+        self.error = None
+        self.wait_seconds = None
+        self.render_seconds = None
+        self._finished = threading.Event()
+
+    @property
+    def state(self):
+        if self.finished_at is not None:
+            return "failed" if self.error else "done"
+        return "running" if self.future.running() else "queued"
+
+    def wait(self, timeout=None):
+        """Blocks until the job is done or failed, up to `timeout` seconds; returns whether it is."""
+        return self._finished.wait(timeout)
+
+
+class ReportQueue:
+    """Bounded, thread-safe queue of render jobs on an executor.
+
+    Any concurrent.futures executor works; render_job is picklable for process pools.
+    """
+
+    def __init__(self, executor, max_depth=DEFAULT_MAX_DEPTH, result_ttl_seconds=DEFAULT_RESULT_TTL_SECONDS):
+        self.executor = executor
+        self.max_depth = max_depth
+        self.result_ttl_seconds = result_ttl_seconds
+        self._lock = threading.Lock()
+        self._jobs = {}     # job id -> ReportJob, in submit order
+        self._pending = {}  # (session id, key) -> ReportJob not finished yet
+        self._ids = itertools.count(1)
+
+    def _prune(self):
+        # Caller holds the lock
+        cutoff = time.time() - self.result_ttl_seconds
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished_at is not None and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def submit(self, session_id, key, employee_data, inputs, weights, generated_on):
+        """Queues a render and returns its ReportJob, or the session's pending job for the same `key`.
+
+        Raises QueueFull when `max_depth` jobs are already queued or running.
+        """
+        with self._lock:
+            self._prune()
+            pending = self._pending.get((session_id, key))
+            if pending is not None:
+                METRICS.count("report_jobs_total", outcome="coalesced")
+                return pending
+            if len(self._pending) >= self.max_depth:
+                METRICS.count("report_jobs_total", outcome="rejected")
+                raise QueueFull(f"{len(self._pending)} reports are already being generated")
+            future = self.executor.submit(render_job, employee_data, inputs, weights, generated_on)
+            job = ReportJob(next(self._ids), session_id, key, future)
+            self._jobs[job.id] = job
+            self._pending[(session_id, key)] = job
+            METRICS.count("report_jobs_total", outcome="submitted")
+        future.add_done_callback(lambda _: self._finish(job))
+        return job
+
+    def _finish(self, job):
+        try:
+            job.pdf_bytes, started_at, job.render_seconds = job.future.result()
+            job.wait_seconds = max(0.0, started_at - job.submitted_at)
+            METRICS.observe("report_queue_seconds", job.wait_seconds, phase="wait")
+            METRICS.observe("report_queue_seconds", job.render_seconds, phase="render")
+            METRICS.count("report_jobs_total", outcome="done")
+        except Exception as exc:  # reported to the session through the job
+            job.error = f"{type(exc).__name__}: {exc}"
+            METRICS.count("report_jobs_total", outcome="failed")
+        with self._lock:
+            job.finished_at = time.time()
+            self._pending.pop((job.session_id, job.key), None)
+        job._finished.set()
+        write_metrics_file()
+
+    def get(self, job_id):
+        """Returns the job with `job_id`, or None once it has been collected or pruned."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def collect(self, job_id):
+        """Removes a finished job and returns it (None if unknown or still pending)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished_at is None:
+                return None
+            return self._jobs.pop(job_id)
+
+    def position(self, job):
+        """Returns how many queued jobs were submitted before `job` and have not started."""
+        with self._lock:
+            return sum(1 for other in self._pending.values()
+                       if other.id < job.id and not other.future.running())
+
+    def stats(self):
+        """Returns the number of queued, running and uncollected finished jobs."""
+        with self._lock:
+            running = sum(1 for job in self._pending.values() if job.future.running())
+            return {"queued": len(self._pending) - running, "running": running,
+                    "finished": len(self._jobs) - len(self._pending), "max_depth": self.max_depth}
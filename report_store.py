@@ -0,0 +1,100 @@
+"""Server-side storage for generated reports.
+
+Each PDF is written once to a directory served by Streamlit's static file handler
+(`server.enableStaticServing`), which streams it to the browser over plain HTTP.
+The page only carries a short link, instead of the whole report base64-encoded into
+the websocket payload. Reports are deleted after a TTL, and each session's disk
+usage is capped by dropping its oldest reports first.
+"""
+from collections import deque
+import os
+import secrets
+import threading
+import time
+
+DEFAULT_TTL_SECONDS = 60 * 60
+DEFAULT_MAX_SESSION_BYTES = 10 * 1024 * 1024
+
+
+class ReportStore:
+    """Thread-safe, TTL-bounded store of PDF files under `root`, published at `url_prefix`."""
+
+    def __init__(self, root, url_prefix, ttl_seconds=DEFAULT_TTL_SECONDS,
+                 max_session_bytes=DEFAULT_MAX_SESSION_BYTES):
+        self.root = root
+        self.url_prefix = url_prefix.rstrip("/")
+        self.ttl_seconds = ttl_seconds
+        self.max_session_bytes = max_session_bytes
+        self._lock = threading.Lock()
+        # (created_at, session_id, file_name, size), oldest first
+        self._reports = deque()
+        self._session_bytes = {}
+        os.makedirs(root, exist_ok=True)
+        self._track_leftover_files()
+
+    def _track_leftover_files(self):
+        # Reports left behind by a previous server process: expired ones are deleted now, the
+        # rest are tracked by their mtime (under no session) so sweep() deletes them on time
+        cutoff = time.time() - self.ttl_seconds
+        leftovers = []
+        for entry in os.scandir(self.root):
+            if entry.is_file() and entry.name.endswith(".pdf"):
+                stat = entry.stat()
+                if stat.st_mtime < cutoff:
+                    self._unlink(entry.name)
+                else:
+                    leftovers.append((stat.st_mtime, None, entry.name, stat.st_size))
+        self._reports.extend(sorted(leftovers))
+        if leftovers:
+            self._session_bytes[None] = sum(report[3] for report in leftovers)
+
+    def _unlink(self, file_name):
+        try:
+            os.remove(os.path.join(self.root, file_name))
+        except FileNotFoundError:
+            pass
+
+    def _forget(self, report):
+        # Caller holds the lock
+        _, session_id, file_name, size = report
+        self._session_bytes[session_id] -= size
+        if self._session_bytes[session_id] <= 0:
+            del self._session_bytes[session_id]
+        self._unlink(file_name)
+
+    def sweep(self):
+        """Deletes every report older than the TTL."""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            while self._reports and self._reports[0][0] < cutoff:
+                self._forget(self._reports.popleft())
+
+    def save(self, session_id, pdf_bytes):
+        """Stores one report for `session_id` and returns the URL it can be downloaded from."""
+        self.sweep()
+        size = len(pdf_bytes)
+        file_name = f"{secrets.token_urlsafe(24)}.pdf"
+        with open(os.path.join(self.root, file_name), "wb") as f:
+            f.write(pdf_bytes)
+
+        with self._lock:
+            # Make room within the session's quota by dropping its oldest reports
+            used = self._session_bytes.get(session_id, 0)
+            if used + size > self.max_session_bytes:
+                kept = deque()
+                for report in self._reports:
+                    if report[1] == session_id and used + size > self.max_session_bytes:
+                        used -= report[3]
+                        self._forget(report)
+                    else:
+                        kept.append(report)
+                self._reports = kept
+            self._reports.append((time.time(), session_id, file_name, size))
+            self._session_bytes[session_id] = self._session_bytes.get(session_id, 0) + size
+
+        return f"{self.url_prefix}/{file_name}"
+
+    def session_bytes(self, session_id):
+        """Returns the bytes currently stored for `session_id`."""
+        with self._lock:
+            return self._session_bytes.get(session_id, 0)
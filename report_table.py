@@ -0,0 +1,144 @@
+"""Single-pass layout of the KPI results table.
+
+Every cell is wrapped once with cached word widths, each row is drawn at the height
+of its tallest cell, and a row that would cross the bottom margin moves to a new page
+that starts with the coloured table header and the current category band again:
+
+    table = KpiTable()
+    table.draw_header(pdf)
+    table.draw_rows(pdf, results, weights)
+"""
+from fpdf import XPos, YPos
+
+HEADER_FILL = (191, 144, 86)  # Corresponds to #BF9056
+BAND_FILL = (242, 182, 109)   # Corresponds to #F2B66D
+# Word widths and wrapped cells kept per table before the caches start over
+MAX_CACHED = 20_000
+
+
+class TextMetrics:
+    """Wraps text to a cell width, caching word widths and wrapped lines per font."""
+
+    def __init__(self):
+        self._widths = {}  # (font key, size, word) -> width in user units
+        self._lines = {}   # (font key, size, width, text) -> wrapped lines
+
+    def width(self, pdf, word):
+        key = (pdf.current_font.fontkey, pdf.font_size_pt, word)
+        width = self._widths.get(key)
+        if width is None:
+            if len(self._widths) >= MAX_CACHED:
+                self._widths.clear()
+            width = self._widths[key] = pdf.get_string_width(word)
+        return width
+
+    def wrap(self, pdf, text, cell_width):
+        """Returns the lines multi_cell would print for `text` in a cell `cell_width` wide."""
+        key = (pdf.current_font.fontkey, pdf.font_size_pt, cell_width, text)
+        lines = self._lines.get(key)
+        if lines is None:
+            if len(self._lines) >= MAX_CACHED:
+                self._lines.clear()
+            lines = self._lines[key] = self._wrap(pdf, text, cell_width - 2 * pdf.c_margin)
+        return lines
+
+    def _wrap(self, pdf, text, max_width):
+        space = self.width(pdf, " ")
+        lines = []
+        for paragraph in text.split("\n"):
+            line, line_width = "", 0.0
+            for word in paragraph.split(" "):
+                word_width = self.width(pdf, word)
+                if line and line_width + space + word_width <= max_width:
+                    line, line_width = f"{line} {word}", line_width + space + word_width
+                    continue
+                if line:
+                    lines.append(line)
+                line, line_width = word, word_width
+                # A word wider than the cell is broken between characters, as multi_cell does
+                while line_width > max_width and len(line) > 1:
+                    cut = len(line) - 1
+                    while cut > 1 and self.width(pdf, line[:cut]) > max_width:
+                        cut -= 1
+                    lines.append(line[:cut])
+                    line = line[cut:]
+                    line_width = self.width(pdf, line)
+            lines.append(line)
+        return lines
+
+
+class KpiTable:
+    """The results table: KPI, input figures and result columns under a coloured header."""
+
+    COLUMNS = ((90, 'L', "Individual KPI"), (60, 'L', "Employee Input Figures"), (40, 'C', "Result / Score"))
+    HEADER_HEIGHT = 7
+    BAND_HEIGHT = 8
+    ROW_HEIGHT = 6
+
+    def __init__(self):
+        self.metrics = TextMetrics()
+        self.width = sum(width for width, _, _ in self.COLUMNS)
+
+    def draw_header(self, pdf):
+        pdf.set_font("Helvetica", 'B', 10)
+        pdf.set_fill_color(*HEADER_FILL)
+        pdf.set_text_color(255, 255, 255)
+        for width, _, title in self.COLUMNS[:-1]:
+            pdf.cell(width, self.HEADER_HEIGHT, title, 1, align='C', fill=True)
+        width, _, title = self.COLUMNS[-1]
+        pdf.cell(width, self.HEADER_HEIGHT, title, 1, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C', fill=True)
+        pdf.set_text_color(0, 0, 0)
+
+    def _draw_band(self, pdf, title):
+        pdf.set_font("Helvetica", 'B', 10)
+        pdf.set_fill_color(*BAND_FILL)
+        pdf.cell(self.width, self.BAND_HEIGHT, title, 1, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='L', fill=True)
+        pdf.set_font("Helvetica", '', 9)
+
+    def _fits(self, pdf, height):
+        return pdf.get_y() + height <= pdf.page_break_trigger
+
+    def _new_page(self, pdf, band_title):
+        pdf.add_page()
+        self.draw_header(pdf)
+        self._draw_band(pdf, f"{band_title} (continued)")
+
+    def draw_rows(self, pdf, results, weights):
+        """Draws a band per category and a row per KPI, starting at the current position."""
+        for category, kpis in results.items():
+            if not kpis:
+                continue
+
+            weight_percent = int(weights.get(category.lower(), 0) * 100)
+            category_title = f"{category} ({weight_percent}%)" if weight_percent > 0 else category
+
+            pdf.set_font("Helvetica", '', 9)
+            rows = [self._measure(pdf, (kpi, data['inputs'], data['result'])) for kpi, data in kpis.items()]
+            # Keep a band together with its first row
+            if not self._fits(pdf, self.BAND_HEIGHT + max(len(lines) for lines in rows[0]) * self.ROW_HEIGHT):
+                pdf.add_page()
+                self.draw_header(pdf)
+            self._draw_band(pdf, category_title)
+            for cells in rows:
+                height = max(len(lines) for lines in cells) * self.ROW_HEIGHT
+                if not self._fits(pdf, height):
+                    self._new_page(pdf, category_title)
+                self._draw_row(pdf, cells, height)
+
+    def _measure(self, pdf, texts):
+        return [self.metrics.wrap(pdf, text, width) for text, (width, _, _) in zip(texts, self.COLUMNS)]
+
+    def _draw_row(self, pdf, cells, height):
+        x, y = pdf.l_margin, pdf.get_y()
+        for lines, (width, align, _) in zip(cells, self.COLUMNS):
+            if height == self.ROW_HEIGHT:
+                pdf.set_xy(x, y)
+                pdf.cell(width, height, lines[0], 1, align=align)
+            else:
+                # Each cell is boxed at the full row height, with its lines from the top
+                pdf.rect(x, y, width, height)
+                for number, line in enumerate(lines):
+                    pdf.set_xy(x, y + number * self.ROW_HEIGHT)
+                    pdf.cell(width, self.ROW_HEIGHT, line, align=align)
+            x += width
+        pdf.set_xy(pdf.l_margin, y + height)
@@ -0,0 +1,212 @@
+from collections import namedtuple
+import math
+
+# numpy and pandas are imported where they are used: the app imports this module for its
+# constants and preview on every cold start, but only scores with numpy after a click
+
+# --- Scoring Configuration ---
+# Category weights
+WEIGHTS = {'financial': 0.20, 'processes': 0.30, 'customers': 0.30, 'teams': 0.20}
+CATEGORIES = ["Financial", "Processes", "Customers", "Teams"]
+
+# Every KPI widget key, in the order the inputs appear on the page
+INPUT_KEYS = [
+    "f1_comp", "f1_plan", "f2_uptime", "f2_avail",
+    "c1_pos", "c1_total", "c2_time", "c2_tickets", "c3_first", "c3_total", "c4_handled", "c5_closed", "c5_opened",
+    "p1_comp", "p1_plan", "p3_root", "p3_total", "p5_esc", "p5_total", "p7_adopted", "p7_proposed",
+    "p2_time", "p2_inc", "p4_actions", "p4_issues", "p6_improv",
+    "t1_cert", "t1_total", "t3_comp", "t3_req", "t6_succ", "t6_total",
+    "t2_score", "t2_staff", "t4_sat", "t4_resp", "t7_contrib", "t7_total", "t5_promo", "t5_total",
+]
+# Inputs entered as hours or scores (st.number_input with a float step); all others are whole counts
+FLOAT_INPUTS = {"f2_uptime", "f2_avail", "c2_time", "p2_time", "t2_score"}
+
+EMPLOYEE_FIELDS = ["name", "id", "manager", "period"]
+
+# kind: "ratio"   -> percentage, counted towards the category average
+#       "average" -> per-unit average, shown only
+#       "count"   -> raw count, shown only
+KPI = namedtuple("KPI", "code category label num den kind inputs_fmt result_fmt")
+
+# Order matches the rows of the PDF results table
+KPIS = [
+    KPI("f1", "Financial", "Project Completion Rate", "f1_comp", "f1_plan", "ratio", "{a} / {b}", "{r:.1f}%"),
+    KPI("f2", "Financial", "System Uptime", "f2_uptime", "f2_avail", "ratio", "{a}h / {b}h", "{r:.1f}%"),
+
+    KPI("p1", "Processes", "Tasks Completed", "p1_comp", "p1_plan", "ratio", "{a} / {b}", "{r:.1f}%"),
+    KPI("p2", "Processes", "Incident Resolution Time", "p2_time", "p2_inc", "average", "{a}h / {b}", "{r:.1f} hrs/inc"),
+    KPI("p3", "Processes", "Root Cause Analysis", "p3_root", "p3_total", "ratio", "{a} / {b}", "{r:.1f}%"),
+    KPI("p4", "Processes", "Problem Prevention", "p4_actions", "p4_issues", "ratio", "{a} / {b}", "{r:.1f}%"),
+    KPI("p5", "Processes", "Issue Escalation Rate", "p5_esc", "p5_total", "ratio", "{a} / {b}", "{r:.1f}%"),
+    KPI("p6", "Processes", "Process Improvement", "p6_improv", None, "count", "{a} initiated", "{a}"),
+    KPI("p7", "Processes", "Innovation Rate", "p7_adopted", "p7_proposed", "ratio", "{a} / {b}", "{r:.1f}%"),
+
+    KPI("c1", "Customers", "Customer Satisfaction", "c1_pos", "c1_total", "ratio", "{a} / {b}", "{r:.1f}%"),
+    KPI("c2", "Customers", "Average Response Time", "c2_time", "c2_tickets", "average", "{a}h / {b}", "{r:.1f} hrs/tkt"),
+    KPI("c3", "Customers", "First Call Resolution", "c3_first", "c3_total", "ratio", "{a} / {b}", "{r:.1f}%"),
+    KPI("c4", "Customers", "Call Volume", "c4_handled", None, "count", "{a} handled", "{a}"),
+    KPI("c5", "Customers", "Tickets Closed vs. Opened", "c5_closed", "c5_opened", "ratio", "{a} / {b}", "{r:.1f}%"),
+
+    KPI("t1", "Teams", "Certification Attainment", "t1_cert", "t1_total", "ratio", "{a} / {b}", "{r:.1f}%"),
+    KPI("t2", "Teams", "Technical Skill Proficiency", "t2_score", "t2_staff", "average", "{a} / {b} staff", "{r:.1f} avg"),
+    KPI("t3", "Teams", "Training Completion", "t3_comp", "t3_req", "ratio", "{a} / {b}", "{r:.1f}%"),
+    KPI("t4", "Teams", "Team Satisfaction", "t4_sat", "t4_resp", "ratio", "{a} / {b}", "{r:.1f}%"),
+    KPI("t5", "Teams", "Employee Development", "t5_promo", "t5_total", "ratio", "{a} / {b}", "{r:.1f}%"),
+    KPI("t6", "Teams", "Project Success Rate", "t6_succ", "t6_total", "ratio", "{a} / {b}", "{r:.1f}%"),
+    KPI("t7", "Teams", "Knowledge Sharing", "t7_contrib", "t7_total", "ratio", "{a} / {b}", "{r:.1f}%"),
+]
+
+KPIS_BY_CODE = {kpi.code: kpi for kpi in KPIS}
+# Widget key -> codes of the KPIs computed from it
+KPI_DEPENDENCIES = {}
+for _kpi in KPIS:
+    for _key in filter(None, (_kpi.num, _kpi.den)):
+        KPI_DEPENDENCIES.setdefault(_key, []).append(_kpi.code)
+
+
+# --- Input Handling ---
+def _is_blank(value):
+    return value is None or value == "" or (isinstance(value, float) and math.isnan(value))
+
+
+def coerce_inputs(raw):
+    """Converts raw KPI values (e.g. CSV cells) to the types the input widgets produce.
+
+    Missing or blank values default to 0, like an untouched widget. Raises ValueError for
+    non-numeric, negative or fractional-count values.
+    """
+    inputs = {}
+    for key in INPUT_KEYS:
+        value = raw.get(key)
+        if _is_blank(value):
+            value = 0
+        try:
+            number = float(value)
+        except OverflowError:  # an int too large for a float, e.g. 10**400 from JSON
+            raise ValueError(f"{key}: the value is too large")
+        except (TypeError, ValueError):
+            raise ValueError(f"{key}: {value!r} is not a number")
+        if not math.isfinite(number) or number < 0:
+            raise ValueError(f"{key}: {value!r} must be a non-negative number")
+        if key in FLOAT_INPUTS:
+            inputs[key] = number
+        elif number.is_integer():
+            inputs[key] = int(number)
+        else:
+            raise ValueError(f"{key}: {value!r} must be a whole number")
+    return inputs
+
+
+def coerce_employee(raw):
+    """Extracts the employee details dict used by create_pdf.
+
+    Raises ValueError if any are missing, or hold characters the report font cannot print.
+    """
+    details = {}
+    for field in EMPLOYEE_FIELDS:
+        value = raw.get(field)
+        if _is_blank(value):
+            raise ValueError(f"{field}: missing")
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        details[field] = str(value).strip()
+        if not details[field]:
+            raise ValueError(f"{field}: missing")
+        # The report is set in a core PDF font, which only covers Latin-1
+        try:
+            details[field].encode("latin-1")
+        except UnicodeEncodeError as exc:
+            raise ValueError(f"{field}: {details[field][exc.start]!r} cannot be printed in the report font")
+    return details
+
+
+# --- Scoring ---
+def kpi_score(kpi, inputs):
+    """Scalar value of one KPI, using the same zero-denominator rule as _score_columns."""
+    a = inputs[kpi.num]
+    if kpi.kind == "count":
+        return a
+    b = inputs[kpi.den]
+    r = a / b if b > 0 else 0
+    return r * 100 if kpi.kind == "ratio" else r
+
+
+def _score_columns(columns):
+    """Computes every KPI, category average and the overall score as array operations.
+
+    `columns` maps widget keys to equal-length float arrays. Summation order matches the
+    original scalar code so single assessments score identically.
+    """
+    import numpy as np
+
+    scores = {}
+    category_scores = {category.lower(): [] for category in CATEGORIES}
+    for kpi in KPIS:
+        a = columns[kpi.num]
+        if kpi.kind == "count":
+            scores[kpi.code] = a
+            continue
+        b = columns[kpi.den]
+        # Same zero-denominator rule as the form: a KPI with nothing to divide by scores 0
+        r = np.divide(a, b, out=np.zeros_like(a), where=b > 0)
+        if kpi.kind == "ratio":
+            r = r * 100
+            category_scores[kpi.category.lower()].append(r)
+        scores[kpi.code] = r
+
+    for name, values in category_scores.items():
+        total = np.zeros_like(columns[INPUT_KEYS[0]])
+        for value in values:
+            total = total + value
+        scores[name] = total / len(values) if values else total
+
+    total_weight = sum(WEIGHTS.values())
+    weighted_sum = np.zeros_like(columns[INPUT_KEYS[0]])
+    for name, weight in WEIGHTS.items():
+        weighted_sum = weighted_sum + scores[name] * weight
+    scores["overall"] = weighted_sum / total_weight if total_weight > 0 else np.zeros_like(weighted_sum)
+    return scores
+
+
+def score_frame(data):
+    """Scores a whole population of assessments at once.
+
+    `data` is a DataFrame (or a mapping of widget key to array) with one row per employee and
+    columns named like INPUT_KEYS; missing columns count as 0. Returns a DataFrame with one
+    column per KPI code (f1, p2, ...), one per category (financial, ...) and "overall".
+    """
+    import numpy as np
+    import pandas as pd
+
+    index = data.index if isinstance(data, pd.DataFrame) else None
+    length = len(data) if index is not None else len(next(iter(data.values()), []))
+    columns = {}
+    for key in INPUT_KEYS:
+        if key in data:
+            columns[key] = np.asarray(data[key], dtype=np.float64)
+        else:
+            columns[key] = np.zeros(length, dtype=np.float64)
+    return pd.DataFrame(_score_columns(columns), index=index)
+
+
+def score_assessment(inputs):
+    """Scores one assessment.
+
+    Returns (results, category_averages, overall_score), where results is the
+    {category: {kpi: {"inputs", "result"}}} table rendered by create_pdf and
+    category_averages is keyed like WEIGHTS.
+    """
+    import numpy as np
+
+    scores = _score_columns({key: np.array([inputs[key]], dtype=np.float64) for key in INPUT_KEYS})
+
+    results = {category: {} for category in CATEGORIES}
+    for kpi in KPIS:
+        a = inputs[kpi.num]
+        b = inputs[kpi.den] if kpi.den else None
+        r = float(scores[kpi.code][0])
+        results[kpi.category][kpi.label] = {"inputs": kpi.inputs_fmt.format(a=a, b=b),
+                                            "result": kpi.result_fmt.format(a=a, r=r)}
+
+    category_averages = {name: float(scores[name][0]) for name in WEIGHTS}
+    return results, category_averages, float(scores["overall"][0])
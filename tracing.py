@@ -0,0 +1,174 @@
+"""Timing spans and Prometheus-style metrics for report generation.
+
+Spans are off by default and then cost one attribute check; enable them with
+ASSESSMENT_TRACING=1, by setting ASSESSMENT_METRICS_FILE, or at runtime through
+TRACER.enabled. Enabled spans feed a histogram per stage, and the spans of one run
+can be collected for a per-run breakdown:
+
+    with collect_spans() as spans:
+        with span("report.render"):
+            ...
+    spans  # [(stage, seconds, depth, start), ...] in completion order
+
+Outcome counters are always recorded. Neither needs Streamlit, so batch workers and
+the report modules can use them too.
+"""
+import bisect
+import contextlib
+import os
+import tempfile
+import threading
+import time
+
+# Upper bounds in seconds; +Inf is implicit
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+METRICS_FILE = os.environ.get("ASSESSMENT_METRICS_FILE")
+
+
+class Histogram:
+    """Cumulative-bucket histogram of durations in seconds (not thread-safe; Metrics locks)."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+
+def _labels(labels):
+    return ",".join(f'{name}="{value}"' for name, value in labels)
+
+
+class Metrics:
+    """Thread-safe registry of labelled histograms and counters, rendered as Prometheus text."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}  # (metric, labels) -> Histogram
+        self._counters = {}    # (metric, labels) -> int
+        self._help = {}
+
+    def describe(self, metric, text):
+        self._help[metric] = text
+
+    def observe(self, metric, seconds, **labels):
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def count(self, metric, amount=1, **labels):
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def render(self):
+        """Returns every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for kind, series in (("histogram", self._histograms), ("counter", self._counters)):
+                previous = None
+                for (metric, labels), value in sorted(series.items()):
+                    if metric != previous:
+                        if metric in self._help:
+                            lines.append(f"# HELP {metric} {self._help[metric]}")
+                        lines.append(f"# TYPE {metric} {kind}")
+                        previous = metric
+                    if kind == "counter":
+                        lines.append(f"{metric}{{{_labels(labels)}}} {value}")
+                        continue
+                    cumulative = 0
+                    for bound, bucket_count in zip(value.buckets + ("+Inf",), value.counts):
+                        cumulative += bucket_count
+                        bucket_labels = _labels(labels + (("le", bound),))
+                        lines.append(f"{metric}_bucket{{{bucket_labels}}} {cumulative}")
+                    lines.append(f"{metric}_sum{{{_labels(labels)}}} {value.sum:.6f}")
+                    lines.append(f"{metric}_count{{{_labels(labels)}}} {value.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Atomically replaces `path` with the current metrics, for a node-exporter textfile collector."""
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+METRICS = Metrics()
+METRICS.describe("report_stage_seconds", "Time spent in each report generation stage.")
+METRICS.describe("report_generations_total", "Report generation requests by outcome.")
+METRICS.describe("report_cache_total", "Report cache lookups by outcome.")
+METRICS.describe("streamlit_rerun_seconds", "Duration of full script and fragment reruns.")
+
+
+class Tracer:
+    """Switch for spans plus the per-thread collectors of the runs being traced."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._local = threading.local()
+
+    def collector(self):
+        return getattr(self._local, "spans", None)
+
+
+TRACER = Tracer(enabled=os.environ.get("ASSESSMENT_TRACING") == "1" or bool(METRICS_FILE))
+
+
+class _Span:
+    __slots__ = ("stage", "start", "depth")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        local = TRACER._local
+        self.depth = getattr(local, "depth", 0)
+        local.depth = self.depth + 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        TRACER._local.depth = self.depth
+        METRICS.observe("report_stage_seconds", seconds, stage=self.stage)
+        spans = TRACER.collector()
+        if spans is not None:
+            spans.append((self.stage, seconds, self.depth, self.start))
+        return False
+
+
+_DISABLED = contextlib.nullcontext()
+
+
+def span(stage):
+    """Context manager timing `stage`; a shared no-op while tracing is disabled."""
+    if not TRACER.enabled:
+        return _DISABLED
+    return _Span(stage)
+
+
+@contextlib.contextmanager
+def collect_spans():
+    """Collects the spans finished on this thread inside the block into the yielded list."""
+    spans = []
+    previous = TRACER.collector()
+    TRACER._local.spans = spans
+    try:
+        yield spans
+    finally:
+        TRACER._local.spans = previous
+
+
+def write_metrics_file():
+    """Writes METRICS to ASSESSMENT_METRICS_FILE when it is configured."""
+    if METRICS_FILE:
+        METRICS.write(METRICS_FILE)